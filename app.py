@@ -1,13 +1,12 @@
 import streamlit as st
-import pandas as pd
-import os
-import time
-from job_scraper.core import crawl_jobs
-from job_scraper.db_manager import query_jobs  # ✅ Add this import
+from job_scraper.crawl_queue import CrawlQueue, start_workers
+from job_scraper.exporters import available_formats, open_exporter, open_exporters
+
+CRAWL_WORKER_PROCESSES = 2
 
 st.set_page_config(page_title="Job Scraper", layout="centered")
 st.title("🕷️ Job Scraper (with Live Logs + ChromaDB Integration)")
-st.caption("Crawls Capgemini, Barclays, and Syngenta career pages — stores results in Excel and ChromaDB.")
+st.caption("Crawls Capgemini, Barclays, and Syngenta career pages — exports results and stores them in ChromaDB.")
 
 # --- Input fields ---
 start_url = st.text_input(
@@ -23,66 +22,139 @@ skills = st.text_input(
 
 max_jobs = st.number_input("Max jobs to crawl", min_value=1, max_value=500, value=20)
 max_pages = st.number_input("Max pages to iterate (for pagination)", min_value=1, max_value=20, value=3)
+concurrency = st.number_input("Pages fetched in parallel", min_value=1, max_value=16, value=4)
+block_resources = st.checkbox("Skip images, fonts and stylesheets (browser crawls)", value=True)
+incremental = st.checkbox("Only new or changed jobs since the last crawl", value=False)
+prefilter = st.checkbox(
+    "Filter on listing text before opening job pages (browser crawls)",
+    value=False,
+    help="Only opens job pages whose link text or URL mentions a skill: far fewer requests, but jobs that "
+         "name the skill only in their description are missed. Barclays always filters on the listing card.",
+)
+lazy_details = st.checkbox(
+    "Fetch job descriptions on demand",
+    value=False,
+    help="Skips per-job detail pages during the crawl (listing fields only); fetch descriptions below afterwards.",
+)
+export_formats = st.multiselect(
+    "Export formats",
+    available_formats(),
+    default=["parquet" if "parquet" in available_formats() else "ndjson"],
+    help="Parquet and NDJSON are appended per day under crawled_output/; Excel is rewritten each run.",
+)
+use_cache = st.checkbox(
+    "Cache HTTP responses on disk (development)",
+    value=False,
+    help="Repeat crawls within a day are served from ./http_cache.sqlite3 instead of the live site.",
+)
+offline = st.checkbox("Offline: only use cached responses", value=False, disabled=not use_cache)
+
+
+@st.cache_resource
+def crawl_queue():
+    """One queue connection per server, shared by every session and rerun."""
+    return CrawlQueue()
+
+
+# Crawls run in background worker processes; this page only submits and polls.
+# start_workers is cheap after the first call and revives workers that died.
+queue = crawl_queue()
+start_workers(processes=CRAWL_WORKER_PROCESSES)
 
 if st.button("🚀 Start Crawling"):
     if not start_url.strip():
         st.error("Please enter a valid URL.")
     else:
-        st.info("Starting job crawling... please wait ⏳")
-
-        # Live placeholders
-        progress_bar = st.progress(0)
-        log_box = st.empty()
-        status_box = st.empty()
-
-        skills_list = [s.strip() for s in skills.split(",") if s.strip()]
-        jobs = []
-        extracted_count = 0
-
-        try:
-            st.write("🕷️ Crawling started... watching logs 👇")
-            with st.spinner("Crawling pages..."):
-                jobs = crawl_jobs(start_url, skills_list, int(max_jobs), int(max_pages))
-                for i, job in enumerate(jobs, start=1):
-                    extracted_count += 1
-                    progress = i / max(len(jobs), 1)
-                    progress_bar.progress(progress)
-                    log_box.text_area(
-                        "🔍 Live Extraction Log (temporary)",
-                        value=f"Extracted job {i}/{len(jobs)}:\n{job.get('title', 'Unknown Title')}\nLink: {job.get('apply_url', '')}\n\n---",
-                        height=250,
-                    )
-                    status_box.info(f"Currently extracting job {i}/{len(jobs)} ...")
-                    time.sleep(0.25)
-
-        except Exception as e:
-            st.error(f"❌ Error during crawl: {e}")
-
-        # --- After crawling ---
-        if jobs:
-            df = pd.DataFrame(jobs)
-            os.makedirs("crawled_output", exist_ok=True)
-
-            # ✅ Detect company from URL
-            company = (
-                "capgemini" if "capgemini.com" in start_url.lower()
-                else "barclays" if "barclays" in start_url.lower()
-                else "syngenta" if "syngenta" in start_url.lower()
-                else "unknown"
-            )
-
-            file_path = f"crawled_output/{company}_jobs.xlsx"
-            df.to_excel(file_path, index=False)
-            st.success(f"✅ Extracted {len(df)} jobs and saved to `{file_path}`")
-            st.dataframe(df.head(10))
-
-            # ✅ Store in ChromaDB
-            try:
-                with st.spinner(f"Indexing {len(jobs)} {company} jobs into ChromaDB..."):
-                    query_jobs(company, jobs)
-                    st.info(f"✅ Stored {len(jobs)} {company} jobs in ChromaDB successfully.")
-            except Exception as e:
-                st.warning(f"⚠️ Failed to store in ChromaDB: {e}")
+        crawl_id = queue.submit({
+            "url": start_url,
+            "skills": [s.strip() for s in skills.split(",") if s.strip()],
+            "max_jobs": int(max_jobs),
+            "max_pages": int(max_pages),
+            "concurrency": int(concurrency),
+            "block_resources": block_resources,
+            "incremental": incremental,
+            "prefilter": prefilter or None,
+            "enrich": not lazy_details,
+            "export": export_formats,
+            "store": True,
+            "cache": use_cache,
+            "offline": use_cache and offline,
+        })
+        st.success(f"✅ Queued crawl `{crawl_id}` — progress below; you can leave or refresh this page.")
+
+
+def _show_results(crawl):
+    jobs = queue.jobs(crawl["id"])
+    st.session_state["crawl"] = {
+        "company": crawl["company"], "jobs": jobs, "skills": crawl["params"].get("skills", []),
+        "formats": crawl["params"].get("export", []),
+    }
 
+
+@st.fragment(run_every="2s")
+def crawl_status():
+    """Recent crawls with live progress; only this fragment reruns while polling."""
+    crawls = queue.list(limit=10)
+    if not crawls:
+        return
+    st.subheader("📋 Crawls")
+    for crawl in crawls:
+        status = crawl["status"]
+        icon = {"queued": "⏳", "running": "🕷️", "crawled": "📥", "indexing": "📥", "done": "✅",
+                "failed": "❌", "cancelled": "🛑"}.get(status, "")
+        st.markdown(f"**{icon} {crawl['company']}** · `{crawl['id']}` · {status} — {crawl['params']['url']}")
+        if status in ("queued", "running"):
+            st.progress(min(crawl["extracted"] / max(crawl["max_jobs"] or 1, 1), 1.0),
+                        text=f"{crawl['extracted']}/{crawl['max_jobs']} jobs · {crawl['message']}")
+            if st.button("Cancel", key=f"cancel-{crawl['id']}"):
+                queue.cancel(crawl["id"])
+        elif status in ("crawled", "indexing"):
+            st.caption(f"{crawl['extracted']} jobs extracted — indexing into ChromaDB ...")
         else:
-            st.warning("⚠️ No jobs found or matched filter.")
+            details = [f"{crawl['extracted']} jobs extracted"]
+            if crawl["stored"] or crawl["duplicates"]:
+                details.append(f"{crawl['stored']} stored in ChromaDB, {crawl['duplicates']} duplicates skipped")
+            if crawl["exports"]:
+                details.append("saved to " + ", ".join(f"`{path}`" for path in crawl["exports"]))
+            if crawl["error"]:
+                details.append(f"error: {crawl['error']}")
+            st.caption(" · ".join(details))
+            if crawl["extracted"] and st.button("Show results", key=f"show-{crawl['id']}"):
+                _show_results(crawl)
+                st.rerun()
+
+
+crawl_status()
+
+# --- On-demand descriptions for jobs crawled without detail pages ---
+crawl = st.session_state.get("crawl")
+if crawl:
+    st.subheader(f"🗂️ {crawl['company']} results ({len(crawl['jobs'])} jobs)")
+    st.dataframe(crawl["jobs"][:10])
+pending = [job for job in crawl["jobs"] if not job.get("enriched", True)] if crawl else []
+if pending:
+    st.subheader("📄 Fetch job descriptions")
+    labels = {
+        f"{i + 1}. {job.get('title') or 'Untitled'} — {job.get('location') or ''}": job
+        for i, job in enumerate(pending)
+    }
+    chosen = st.multiselect("Jobs to fetch", list(labels), default=list(labels)[:10])
+    if st.button("Fetch selected descriptions") and chosen:
+        selected = [labels[label] for label in chosen]
+        # Imported here: the crawler and ChromaDB are only needed once descriptions are fetched
+        from job_scraper.core import enrich_jobs
+        from job_scraper.db_manager import store_jobs
+
+        with st.spinner(f"Fetching {len(selected)} job pages..."):
+            enriched = enrich_jobs(selected, crawl["skills"])
+            # Appending formats get the completed rows; Excel is rewritten with every job
+            with open_exporters([f for f in crawl["formats"] if f != "excel"], crawl["company"]) as exporter:
+                exporter.write_many(job for job in selected if job.get("enriched"))
+            if "excel" in crawl["formats"]:
+                with open_exporter("excel", crawl["company"]) as excel:
+                    excel.write_many(crawl["jobs"])
+            try:
+                store_jobs(crawl["company"], [job for job in selected if job.get("enriched")])
+            except Exception as e:
+                st.warning(f"⚠️ Failed to update ChromaDB: {e}")
+        st.success(f"✅ Fetched {enriched}/{len(selected)} descriptions and updated the exports.")
@@ -0,0 +1,153 @@
+"""
+Parsing micro-benchmark on the synthetic fixture pages in benchmarks/fixtures.
+
+Compares the original code path (full BeautifulSoup tree on "html.parser")
+with every backend job_scraper.html_backend can use here.
+
+    python benchmarks/bench_parsing.py [--repeat 50] [--json out.json]
+"""
+import argparse
+import html
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from job_scraper import html_backend  # noqa: E402
+from job_scraper.core import BARCLAYS_DESCRIPTION_SELECTOR, _parse_barclays_card, clean_html  # noqa: E402
+from job_scraper.extractors import extract_job_details  # noqa: E402
+from job_scraper.html_backend import make_soup, only, select_first_text  # noqa: E402
+from job_scraper.parsers import get_job_links  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+# --------------------------- #
+# ✅ Workloads
+# --------------------------- #
+def optimized_tasks(pages):
+    """The current code paths; which parser they use depends on html_backend.BACKEND."""
+    return {
+        "capgemini_clean_html": lambda: [clean_html(j["description"]) for j in pages["capgemini"]],
+        "barclays_listing": lambda: [
+            _parse_barclays_card(c)
+            for c in make_soup(pages["barclays_listing"], parse_only=only(class_="list-item--card"))
+            .select(".list-item.list-item--card")
+        ],
+        "barclays_detail": lambda: select_first_text(pages["barclays_detail"], BARCLAYS_DESCRIPTION_SELECTOR),
+        "syngenta_tiles": lambda: [
+            t.select_one(".attrax-vacancy-tile__title")
+            for t in make_soup(pages["syngenta_listing"], parse_only=only(class_="attrax-vacancy-tile"))
+            .select(".attrax-vacancy-tile")
+        ],
+        "worker_job_links": lambda: get_job_links(
+            make_soup(pages["barclays_listing"], parse_only=only("a")), "https://search.jobs.barclays/search-jobs"
+        ),
+        "worker_job_details": lambda: extract_job_details(make_soup(pages["generic_job"]), "https://example.com/jobs/1"),
+    }
+
+
+def baseline_tasks(pages):
+    """The pre-backend code paths: one full html.parser tree per step."""
+
+    def old_clean_html(raw):
+        soup = BeautifulSoup(html.unescape(raw), "html.parser")
+        return " ".join(soup.get_text(separator=" ", strip=True).split())
+
+    def old_detail():
+        section = BeautifulSoup(pages["barclays_detail"], "html.parser").select_one(BARCLAYS_DESCRIPTION_SELECTOR)
+        return old_clean_html(section.get_text()) if section else ""
+
+    return {
+        "capgemini_clean_html": lambda: [old_clean_html(j["description"]) for j in pages["capgemini"]],
+        "barclays_listing": lambda: [
+            _parse_barclays_card(c)
+            for c in BeautifulSoup(pages["barclays_listing"], "html.parser").select(".list-item.list-item--card")
+        ],
+        "barclays_detail": old_detail,
+        "syngenta_tiles": lambda: [
+            t.select_one(".attrax-vacancy-tile__title")
+            for t in BeautifulSoup(pages["syngenta_listing"], "html.parser").select(".attrax-vacancy-tile")
+        ],
+        "worker_job_links": lambda: get_job_links(
+            BeautifulSoup(pages["barclays_listing"], "html.parser"), "https://search.jobs.barclays/search-jobs"
+        ),
+        "worker_job_details": lambda: extract_job_details(
+            BeautifulSoup(pages["generic_job"], "html.parser"), "https://example.com/jobs/1"
+        ),
+    }
+
+
+def time_task(fn, repeat):
+    fn()  # warm-up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def available_backends():
+    backends = ["html.parser"]
+    if html_backend.HAS_LXML:
+        backends.append("lxml")
+    if html_backend.HAS_SELECTOLAX:
+        backends.append("selectolax")
+    return backends
+
+
+def run(repeat=50):
+    pages = {
+        "capgemini": json.loads(load_fixture("capgemini_api_page.json"))["data"],
+        "barclays_listing": load_fixture("barclays_listing.html"),
+        "barclays_detail": load_fixture("barclays_detail.html"),
+        "syngenta_listing": load_fixture("syngenta_listing.html"),
+        "generic_job": load_fixture("generic_job.html"),
+    }
+
+    results = {"baseline": {name: time_task(fn, repeat) for name, fn in baseline_tasks(pages).items()}}
+    original_backend = html_backend.BACKEND
+    try:
+        for backend in available_backends():
+            html_backend.BACKEND = backend
+            results[backend] = {name: time_task(fn, repeat) for name, fn in optimized_tasks(pages).items()}
+    finally:
+        html_backend.BACKEND = original_backend
+    return results
+
+
+def print_table(results):
+    columns = list(results)
+    print(f"{'task (ms/op)':<24}" + "".join(f"{c:>14}" for c in columns))
+    for task in results["baseline"]:
+        row = f"{task:<24}"
+        for c in columns:
+            ms = results[c][task]
+            speedup = results["baseline"][task] / ms if ms else 0
+            row += f"{ms:>8.2f} ({speedup:>3.1f}x)" if c != "baseline" else f"{ms:>14.2f}"
+        print(row)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--json", help="also write the timings to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    print_table(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
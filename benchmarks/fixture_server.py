@@ -0,0 +1,121 @@
+"""
+Local stand-in for the career sites, serving the fixtures in
+benchmarks/fixtures so crawlers can be timed without touching the network.
+The fixtures are synthetic: page structure modelled on each site (the
+selectors and API fields the crawlers read) filled with generated job
+text, not captures of the live sites. Timings measure the crawler code,
+not real-site behaviour.
+"""
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class FixtureServer:
+    """
+    Serves, for `pages` listing pages each (empty afterwards):
+      /api/job-search?page=N     Capgemini API page (JSON)
+      /search-jobs?CurrentPage=N Barclays listing, /job/... Barclays detail
+      /jobs?page=N               Syngenta tiles
+    Job IDs and links are made unique per page. `latency` (seconds) is added
+    to every response to imitate a real round-trip.
+
+        with FixtureServer(pages=5, latency=0.05) as server:
+            crawl_barclays(server.url("/search-jobs"), [])
+    """
+
+    def __init__(self, pages=5, latency=0.0):
+        self.pages = pages
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._capgemini = json.loads(load_fixture("capgemini_api_page.json"))
+        self._barclays_listing = load_fixture("barclays_listing.html")
+        self._barclays_detail = load_fixture("barclays_detail.html").encode("utf-8")
+        self._syngenta_listing = load_fixture("syngenta_listing.html")
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def url(self, path):
+        return self.base_url + path
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # --- responses ---
+    def _capgemini_page(self, page):
+        if page > self.pages:
+            return {"data": []}
+        data = []
+        for job in self._capgemini["data"]:
+            job = dict(job, id=f"{job['id']}-p{page}")
+            job["apply_job_url"] = f"{job['apply_job_url']}-p{page}"
+            data.append(job)
+        return {"data": data}
+
+    def _listing(self, html, marker, page):
+        if page > self.pages:
+            # Same page chrome, but no element carries the card class any more
+            return html.replace(marker, marker[:-1] + '-empty"')
+        return html.replace('href="/job/', f'href="/job/p{page}-')
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                if parsed.path == "/api/job-search":
+                    body = json.dumps(server._capgemini_page(int(query["page"][0]))).encode("utf-8")
+                    content_type = "application/json"
+                elif parsed.path == "/search-jobs":
+                    page = int(query.get("CurrentPage", ["1"])[0])
+                    body = server._listing(server._barclays_listing, 'class="list-item list-item--card"', page).encode("utf-8")
+                    content_type = "text/html"
+                elif parsed.path.startswith("/job/"):
+                    body = server._barclays_detail
+                    content_type = "text/html"
+                elif parsed.path == "/jobs":
+                    page = int(query.get("page", ["1"])[0])
+                    body = server._listing(server._syngenta_listing, 'class="attrax-vacancy-tile"', page).encode("utf-8")
+                    content_type = "text/html"
+                else:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
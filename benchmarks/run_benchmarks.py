@@ -0,0 +1,469 @@
+"""
+Benchmark suite for the crawlers and the ChromaDB search paths.
+
+Crawlers run against a local stand-in server serving the synthetic pages
+in benchmarks/fixtures (generated, not recorded from the live sites);
+db_manager ingestion and search run on synthetic corpora in a temporary
+Chroma directory. Results are written as JSON so runs can be compared.
+
+    python benchmarks/run_benchmarks.py [--sizes 1000,10000,100000]
+        [--pages 5] [--latency 0.02] [--embedding hash|default]
+        [--embedding-backends onnx,onnx-int8] [--skip-startup]
+        [--output results.json] [--compare previous.json]
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+from chromadb.api.types import EmbeddingFunction  # noqa: E402
+
+from fixture_server import FixtureServer, load_fixture  # noqa: E402
+from job_scraper import core, db_manager, html_backend, run_playwright_worker  # noqa: E402
+from job_scraper.dedup import JobDeduplicator  # noqa: E402
+from job_scraper.embeddings import BACKENDS, CachedEmbeddingFunction, EmbeddingStore  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+
+class HashEmbedding(EmbeddingFunction):
+    """
+    Deterministic bag-of-words hashing embedding (384 dims like MiniLM).
+    Takes the model out of the measurement so Chroma overhead is visible.
+    """
+
+    def __init__(self, dims=384):
+        self.dims = dims
+
+    def __call__(self, input):
+        vectors = []
+        for text in input:
+            v = np.zeros(self.dims, dtype=np.float32)
+            for word in text.lower().split():
+                v[int(hashlib.md5(word.encode("utf-8")).hexdigest()[:8], 16) % self.dims] += 1.0
+            norm = np.linalg.norm(v)
+            vectors.append(v / norm if norm else v)
+        return vectors
+
+    @staticmethod
+    def name():
+        return "bench_hash"
+
+    def get_config(self):
+        return {"dims": self.dims}
+
+    @staticmethod
+    def build_from_config(config):
+        return HashEmbedding(config.get("dims", 384))
+
+
+@contextlib.contextmanager
+def quiet():
+    """Swallow the crawlers' progress prints while timing."""
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+# --------------------------- #
+# ✅ Crawlers
+# --------------------------- #
+def bench_crawlers(pages, latency):
+    results = {}
+    with FixtureServer(pages=pages, latency=latency) as server:
+        core.CAPGEMINI_API_URL = server.url("/api/job-search")
+        core.BARCLAYS_BASE_URL = server.base_url
+        run_playwright_worker.SYNGENTA_BASE_URL = server.base_url
+
+        runs = {
+            "crawl_capgemini_api[sequential]": lambda: core.crawl_capgemini_api(
+                "https://www.capgemini.com", [], max_jobs=pages * 50, max_pages=pages + 1, concurrency=1
+            ),
+            "crawl_capgemini_api[concurrency=8]": lambda: core.crawl_capgemini_api(
+                "https://www.capgemini.com", [], max_jobs=pages * 50, max_pages=pages + 1, concurrency=8
+            ),
+            "crawl_barclays": lambda: core.crawl_barclays(
+                server.url("/search-jobs"), [], max_jobs=pages * 25, max_pages=pages + 1, rate_per_host=None
+            ),
+            "scrape_syngenta_html": lambda: run_playwright_worker.scrape_syngenta_html(
+                server.url("/jobs"), [], max_jobs=pages * 20, max_pages=pages + 1
+            ),
+        }
+        for name, run in runs.items():
+            before = server.requests
+            with quiet():
+                jobs, seconds = timed(run)
+            results[name] = {
+                "seconds": seconds,
+                "jobs": len(jobs),
+                "requests": server.requests - before,
+                "jobs_per_sec": len(jobs) / seconds if seconds else 0.0,
+            }
+    return results
+
+
+def bench_clean_html(repeat=5):
+    descriptions = [j["description"] for j in json.loads(load_fixture("capgemini_api_page.json"))["data"]]
+    _, seconds = timed(lambda: [core.clean_html(d) for _ in range(repeat) for d in descriptions])
+    docs = len(descriptions) * repeat
+    return {"seconds": seconds, "docs": docs, "ms_per_doc": seconds / docs * 1000}
+
+
+# --------------------------- #
+# ✅ Ingestion and search
+# --------------------------- #
+WORDS = (
+    "python java sql cloud azure aws data engineer analyst developer agile scrum kubernetes docker "
+    "api rest testing automation security risk banking payments platform sap abap react angular "
+    "spark kafka etl devops linux network support consultant architect manager lead senior junior"
+).split()
+LOCATIONS = ["Pune", "Bangalore", "Mumbai", "London", "Glasgow", "Basel", "New York", "Chennai"]
+COMPANIES = ["capgemini", "barclays", "syngenta"]
+QUERIES = ["Python developer", "SAP ABAP consultant", "cloud security engineer", "data engineer spark",
+           "java backend", "devops kubernetes", "banking payments analyst", "react frontend"]
+
+
+def synthetic_jobs(n, seed=42):
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {
+            "job_id": f"bench-{i}",
+            "title": " ".join(rng.sample(WORDS, 3)).title(),
+            "location": rng.choice(LOCATIONS),
+            "apply_url": f"https://example.com/jobs/{i}",
+            "description": " ".join(rng.choice(WORDS) for _ in range(80)),
+        }
+
+
+def bench_db(size, embedding):
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench_chroma_") as path:
+        db_manager.configure(path=path, embedding_function=embedding)
+
+        by_company = {c: [] for c in COMPANIES}
+        for i, job in enumerate(synthetic_jobs(size)):
+            by_company[COMPANIES[i % len(COMPANIES)]].append(job)
+
+        with quiet():
+            _, seconds = timed(lambda: [db_manager.store_jobs(c, jobs) for c, jobs in by_company.items()])
+        results["ingest"] = {"seconds": seconds, "docs": size, "docs_per_sec": size / seconds if seconds else 0.0}
+
+        def search_all(mode="semantic"):
+            for q in QUERIES:
+                db_manager.query_jobs(query_text=q, n_results=10, mode=mode)
+
+        db_manager.configure()  # cold caches
+        db_manager.count_jobs(query_text=QUERIES[0])  # builds the BM25 index outside the timings
+        _, cold = timed(search_all)
+        _, warm = timed(search_all)
+        results["search"] = {"cold_ms": cold / len(QUERIES) * 1000, "warm_ms": warm / len(QUERIES) * 1000}
+        for mode in ("keyword", "hybrid"):
+            db_manager.configure()
+            _, seconds = timed(lambda: search_all(mode))
+            results["search"][f"{mode}_cold_ms"] = seconds / len(QUERIES) * 1000
+        _, seconds = timed(lambda: [db_manager.count_jobs(query_text=q) for q in QUERIES])
+        results["count_query_ms"] = seconds / len(QUERIES) * 1000
+
+        _, seconds = timed(lambda: db_manager.count_jobs())
+        results["count_all_ms"] = seconds * 1000
+        _, seconds = timed(lambda: db_manager.count_jobs(location="Pune"))
+        results["count_filtered_ms"] = seconds * 1000
+
+        middle = max(1, size // 20 // 2)
+        _, seconds = timed(lambda: db_manager.get_jobs_page(page=middle, page_size=20))
+        results["browse_page_ms"] = seconds * 1000
+    return results
+
+
+def bench_dedup(size, repost_rate=0.05, seed=7):
+    """Near-duplicate filtering over `size` jobs plus lightly edited reposts of some of them."""
+    rng = random.Random(seed)
+    jobs = list(synthetic_jobs(size))
+    reposts = []
+    for job in rng.sample(jobs, int(size * repost_rate)):
+        words = job["description"].split()
+        words[rng.randrange(len(words))] = "updated"
+        reposts.append(dict(job, job_id=f"{job['job_id']}-repost", apply_url=job["apply_url"] + "-repost",
+                            description=" ".join(words)))
+
+    index = JobDeduplicator()
+    kept, seconds = timed(lambda: sum(1 for _ in index.filter(jobs + reposts, key=lambda job: job["job_id"])))
+    stats = index.stats()
+    return {
+        "seconds": seconds,
+        "jobs_per_sec": (size + len(reposts)) / seconds if seconds else 0.0,
+        "kept": kept,
+        "repost_recall": stats["near_duplicates"] / len(reposts) if reposts else 1.0,
+    }
+
+
+# --------------------------- #
+# ✅ Embeddings
+# --------------------------- #
+def bench_embedding_cache(size):
+    """Cold vs warm ingestion-sized embedding through the content-hash store (model-free)."""
+    documents = [job["description"] for job in synthetic_jobs(size)]
+    with tempfile.TemporaryDirectory(prefix="bench_embeddings_") as path:
+        cached = CachedEmbeddingFunction(HashEmbedding(), EmbeddingStore(os.path.join(path, "cache.sqlite3")))
+        _, cold = timed(lambda: cached(documents))
+        _, warm = timed(lambda: cached(documents))
+        cached.store.close()
+    return {"docs": size, "cold_seconds": cold, "warm_seconds": warm,
+            "warm_docs_per_sec": size / warm if warm else 0.0}
+
+
+def _top_k(vectors, k):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, -np.inf)
+    return np.argsort(-similarity, axis=1)[:, :k]
+
+
+def bench_embedding_backends(names, size=1000, k=10):
+    """
+    Throughput of each embedding backend on `size` synthetic descriptions,
+    and recall@k of its nearest neighbours against Chroma's default function.
+    Backends that can't load (model not downloaded, onnx missing) are skipped.
+    """
+    documents = [job["description"] for job in synthetic_jobs(size, seed=3)]
+    results, reference = {}, None
+    for name in ["default"] + [n for n in names if n != "default"]:
+        try:
+            fn = BACKENDS[name]()
+            fn(documents[:2])  # load/download/quantize outside the timing
+            vectors, seconds = timed(lambda: fn(documents))
+        except Exception as e:  # noqa: BLE001 - report and move on to the next backend
+            print(f"  ⚠️ {name}: skipped ({e})")
+            continue
+        neighbours = _top_k(vectors, k)
+        if name == "default":
+            reference = neighbours
+        recall = None
+        if reference is not None:
+            recall = float(np.mean([len(set(a) & set(b)) / k for a, b in zip(neighbours, reference)]))
+        if name in names:
+            results[name] = {"seconds": seconds, "docs_per_sec": size / seconds if seconds else 0.0,
+                             f"recall_at_{k}": recall}
+    return results
+
+
+# --------------------------- #
+# ✅ Startup
+# --------------------------- #
+STARTUP_MODULES = [
+    "job_scraper.db_manager", "job_scraper.core", "job_scraper.crawl_queue",
+    "job_scraper.exporters", "streamlit",
+]
+
+# Run in a fresh interpreter: time to the first Chroma client and first embedded query
+FIRST_USE_SCRIPT = """
+import json, os, sys, tempfile, time
+from job_scraper import db_manager
+path = tempfile.mkdtemp(prefix="bench_startup_")
+db_manager.configure(path=path)
+out = {}
+started = time.perf_counter()
+db_manager.get_client()
+out["first_client_ms"] = (time.perf_counter() - started) * 1000
+started = time.perf_counter()
+try:
+    # An empty embedding cache, so the model really runs
+    from job_scraper.embeddings import make_embedding_function
+    db_manager.configure(embedding_function=make_embedding_function(cache_path=os.path.join(path, "cache.sqlite3")))
+    db_manager.embed_query("python developer")
+    out["first_embedding_ms"] = (time.perf_counter() - started) * 1000
+except Exception as e:  # model not downloaded, onnx missing
+    print(f"first embedding skipped: {e}", file=sys.stderr)
+print(json.dumps(out))
+"""
+
+
+def _import_time(module, top=5):
+    """
+    Cold import of `module` in a fresh interpreter (`python -X importtime`):
+    total milliseconds and the `top` slowest packages it pulled in.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+    entries = []
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package", children indented above their parent
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, total, name = line[len("import time:"):].split("|")
+        entries.append((len(name) - len(name.lstrip()), name.strip(), int(total) / 1000))
+    # The module's own line comes last; what it pulled in is the indented run just before it
+    # (interpreter startup like `site` is left out)
+    end = max(i for i, (depth, name, _) in enumerate(entries) if name == module and depth == 1)
+    start = end
+    while start > 0 and entries[start - 1][0] > 1:
+        start -= 1
+    packages = {}
+    for _, name, ms in entries[start:end]:
+        top_level = name.split(".")[0]
+        if top_level != module.split(".")[0]:
+            packages[top_level] = max(packages.get(top_level, 0.0), ms)
+    slowest = sorted(packages.items(), key=lambda item: -item[1])
+    return {"import_ms": entries[end][2], "slowest": {name: round(ms, 1) for name, ms in slowest[:top]}}
+
+
+def bench_startup():
+    """Cold-start cost: per-module import time, then the first client and embedding."""
+    results = {}
+    for module in STARTUP_MODULES:
+        try:
+            results[module] = _import_time(module)
+        except (OSError, RuntimeError) as e:
+            print(f"  ⚠️ {module}: skipped ({e})")
+    proc = subprocess.run([sys.executable, "-c", FIRST_USE_SCRIPT], cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode == 0 and proc.stdout.strip():
+        results["first_use"] = json.loads(proc.stdout.strip().splitlines()[-1])
+    else:
+        print(f"  ⚠️ first use: skipped ({proc.stderr.strip()[-200:]})")
+    return results
+
+
+# --------------------------- #
+# ✅ Reporting
+# --------------------------- #
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parser_backend": html_backend.BACKEND,
+    }
+
+
+def _flatten(tree, prefix=""):
+    for key, value in tree.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten(value, name + ".")
+        elif isinstance(value, (int, float)):
+            yield name, value
+
+
+def compare(previous, current):
+    """Print every timing that moved by more than 10% between two result files."""
+    before = dict(_flatten({k: v for k, v in previous.items() if k != "meta"}))
+    print(f"\n📊 Compared with {previous['meta'].get('commit') or previous['meta']['timestamp']}:")
+    for name, value in _flatten({k: v for k, v in current.items() if k != "meta"}):
+        old = before.get(name)
+        if not old or not (name.endswith("seconds") or name.endswith("_ms")):
+            continue
+        change = (value - old) / old
+        if abs(change) >= 0.10:
+            flag = "🔺 slower" if change > 0 else "🟢 faster"
+            print(f"  {flag} {name}: {old:.4f} → {value:.4f} ({change:+.0%})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the crawler and search benchmarks.")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="synthetic corpus sizes for db_manager")
+    parser.add_argument("--pages", type=int, default=5, help="listing pages served per site")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to every stand-in response")
+    parser.add_argument("--embedding", choices=["hash", "default"], default="hash",
+                        help="hash: model-free embedding (measures Chroma); default: Chroma's MiniLM")
+    parser.add_argument("--embedding-backends", default="onnx,onnx-int8",
+                        help="comma-separated embedding backends to compare with the default "
+                             "(default, onnx, onnx-int8; empty to skip); needs the MiniLM model")
+    parser.add_argument("--skip-startup", action="store_true", help="don't measure import and first-use times")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="previous result file to diff against")
+    args = parser.parse_args(argv)
+
+    results = {"meta": environment()}
+    results["meta"].update(pages=args.pages, latency=args.latency, embedding=args.embedding)
+
+    if not args.skip_startup:
+        print("⏱️ Startup ...")
+        results["startup"] = bench_startup()
+        for name, r in results["startup"].items():
+            if name == "first_use":
+                print("  first use: " + ", ".join(f"{k} {v:.0f} ms" for k, v in r.items()))
+            else:
+                slowest = ", ".join(f"{n} {ms:.0f}" for n, ms in r["slowest"].items())
+                print(f"  import {name:<24} {r['import_ms']:7.0f} ms  ({slowest})")
+
+    print("🕷️ Crawlers ...")
+    results["crawlers"] = bench_crawlers(args.pages, args.latency)
+    for name, r in results["crawlers"].items():
+        print(f"  {name:<38} {r['seconds']:7.2f}s  {r['jobs']:5d} jobs  {r['jobs_per_sec']:8.1f} jobs/sec")
+
+    results["clean_html"] = bench_clean_html()
+    print(f"🧹 clean_html: {results['clean_html']['ms_per_doc']:.2f} ms/doc")
+
+    embedding = HashEmbedding() if args.embedding == "hash" else None
+    results["db"] = {}
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        print(f"🗄️ db_manager with {size} jobs ...")
+        r = bench_db(size, embedding or db_manager.embedding_fn)
+        r["dedup"] = bench_dedup(size)
+        results["db"][str(size)] = r
+        print(
+            f"  ingest {r['ingest']['docs_per_sec']:.0f} docs/sec | search cold {r['search']['cold_ms']:.1f} ms, "
+            f"warm {r['search']['warm_ms']:.2f} ms, keyword {r['search']['keyword_cold_ms']:.1f} ms, "
+            f"hybrid {r['search']['hybrid_cold_ms']:.1f} ms | count {r['count_filtered_ms']:.1f} ms, "
+            f"query matches {r['count_query_ms']:.1f} ms | "
+            f"browse page {r['browse_page_ms']:.1f} ms | dedup {r['dedup']['jobs_per_sec']:.0f} jobs/sec, "
+            f"repost recall {r['dedup']['repost_recall']:.0%}"
+        )
+
+    results["embedding_cache"] = bench_embedding_cache(max(int(s) for s in args.sizes.split(",") if s.strip()))
+    print(
+        f"🧠 embedding cache: cold {results['embedding_cache']['cold_seconds']:.2f}s, "
+        f"warm {results['embedding_cache']['warm_seconds']:.2f}s "
+        f"({results['embedding_cache']['warm_docs_per_sec']:.0f} docs/sec)"
+    )
+    backends = [b.strip() for b in args.embedding_backends.split(",") if b.strip()]
+    if backends:
+        print("🧠 Embedding backends ...")
+        results["embedding_backends"] = bench_embedding_backends(backends)
+        for name, r in results["embedding_backends"].items():
+            recall = "n/a" if r["recall_at_10"] is None else f"{r['recall_at_10']:.0%}"
+            print(f"  {name:<12} {r['docs_per_sec']:8.1f} docs/sec  recall@10 vs default {recall}")
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
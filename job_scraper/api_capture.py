@@ -0,0 +1,366 @@
+import asyncio
+import json
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+from .crawl_state import content_hash
+from .dedup import normalize_url
+from .extractors import extract_job_details
+from .fetcher import HostLimiter, fetch, make_session
+from .html_backend import html_to_text, make_soup
+from .skills import SkillMatcher
+
+# Field names career-site APIs commonly use, most specific first (matched case-insensitively)
+TITLE_KEYS = ("title", "jobtitle", "job_title", "positiontitle", "jobname", "position", "name")
+ID_KEYS = ("job_id", "jobid", "requisitionid", "reqid", "jobreqid", "ref", "reference", "id", "slug")
+URL_KEYS = ("apply_url", "applyurl", "joburl", "job_url", "absolute_url", "canonicalpositionurl", "url", "link",
+            "href", "externalpath")
+LOCATION_KEYS = ("location", "locations", "joblocation", "locationstext", "location_name", "primarylocation", "city",
+                 "country")
+DESCRIPTION_KEYS = ("description", "jobdescription", "job_description", "summary", "shortdescription",
+                    "descriptionteaser", "content")
+DATE_KEYS = ("date_posted", "dateposted", "posteddate", "postedon", "publisheddate", "published_at", "createddate",
+             "created_at")
+# A title and an id/URL alone also describe menus and news feeds; job listings carry one of these too
+JOB_SIGNAL_KEYS = LOCATION_KEYS + DATE_KEYS + ("job_id", "jobid", "requisitionid", "requisition", "reqid",
+                                               "jobreqid", "vacancyid", "postingid")
+# ... or come from an endpoint whose path says so
+JOB_PATH_RE = re.compile(r"job|search|vacanc|requisition|posting|opening|position", re.I)
+PAGE_KEYS = ("page", "pagenumber", "pageno", "page_number", "pageindex", "p")
+OFFSET_KEYS = ("offset", "from", "start", "skip", "startindex")
+SIZE_KEYS = ("size", "limit", "pagesize", "page_size", "per_page", "perpage", "rows", "hitsperpage", "num")
+_DROP_HEADERS = {"host", "content-length", "cookie", "accept-encoding", "connection"}
+
+
+def _lower_keys(item):
+    return {str(k).lower(): v for k, v in item.items()}
+
+
+def _text(value):
+    """Flatten an API field (string, number, {name: ...} or a list of those) to text."""
+    if value is None or isinstance(value, bool):
+        return ""
+    if isinstance(value, (str, int, float)):
+        return str(value).strip()
+    if isinstance(value, dict):
+        fields = _lower_keys(value)
+        for key in ("name", "label", "city", "value", "text", "title"):
+            if fields.get(key):
+                return _text(fields[key])
+        return ""
+    if isinstance(value, list):
+        return "; ".join(t for t in (_text(v) for v in value) if t)
+    return ""
+
+
+def _first(fields, keys):
+    for key in keys:
+        text = _text(fields.get(key))
+        if text:
+            return text
+    return ""
+
+
+def _looks_like_job(item, job_endpoint=False):
+    if not isinstance(item, dict):
+        return False
+    fields = _lower_keys(item)
+    has_title = any(isinstance(fields.get(k), str) and fields[k].strip() for k in TITLE_KEYS)
+    has_ref = any(fields.get(k) for k in ID_KEYS + URL_KEYS)
+    has_signal = job_endpoint or any(fields.get(k) for k in JOB_SIGNAL_KEYS)
+    return has_title and has_ref and has_signal
+
+
+def find_job_list(payload, max_depth=4, url=None):
+    """
+    (path, items) of the longest list in a JSON payload whose items look like
+    job postings, or None: a title, an ID or URL, and a job-specific field
+    (location, date, requisition id) unless the request `url` is itself a
+    job/search endpoint. `path` is the key sequence leading to the list, so
+    later pages can be read the same way.
+    """
+    job_endpoint = bool(url and JOB_PATH_RE.search(urlparse(url).path))
+    best = None
+    stack = [((), payload, 0)]
+    while stack:
+        path, node, depth = stack.pop()
+        if isinstance(node, list):
+            sample = [item for item in node[:10] if isinstance(item, dict)]
+            if sample and sum(_looks_like_job(item, job_endpoint) for item in sample) * 2 >= len(sample):
+                if best is None or len(node) > len(best[1]):
+                    best = (path, node)
+        elif isinstance(node, dict) and depth < max_depth:
+            for key, value in node.items():
+                if isinstance(value, (dict, list)):
+                    stack.append((path + (key,), value, depth + 1))
+    return best
+
+
+def items_at(payload, path):
+    """The list at `path` in a later page of the same API, found afresh if the shape moved."""
+    node = payload
+    for key in path:
+        if not isinstance(node, dict) or key not in node:
+            found = find_job_list(payload)
+            return found[1] if found else []
+        node = node[key]
+    return node if isinstance(node, list) else []
+
+
+def item_to_job(item, base_url, company):
+    """Map one API listing item onto the crawler's job dict."""
+    fields = _lower_keys(item)
+    link = _first(fields, URL_KEYS)
+    if link and not link.startswith("http"):
+        link = urljoin(base_url, link)
+    description = _first(fields, DESCRIPTION_KEYS)
+    if "<" in description:
+        description = html_to_text(description)
+    return {
+        "job_id": _first(fields, ID_KEYS) or (link.rstrip("/").split("/")[-1] if link else ""),
+        "title": _first(fields, TITLE_KEYS) or "N/A",
+        "company": company,
+        "location": _first(fields, LOCATION_KEYS) or "N/A",
+        "date_posted": _first(fields, DATE_KEYS) or None,
+        "apply_url": link or None,
+        "description": description,
+    }
+
+
+# --------------------------- #
+# ✅ Capturing the listing API
+# --------------------------- #
+class CapturedApi:
+    """One JSON listing response seen during the first render, with the request that produced it."""
+
+    def __init__(self, url, method, post_data, headers, path, items):
+        self.url = url
+        self.method = method
+        self.post_data = post_data
+        self.headers = {k: v for k, v in (headers or {}).items()
+                        if not k.startswith(":") and k.lower() not in _DROP_HEADERS}
+        self.path = path
+        self.items = items
+
+    def _body(self):
+        if self.method == "GET" or not self.post_data:
+            return None
+        try:
+            body = json.loads(self.post_data)
+        except ValueError:
+            return None
+        return body if isinstance(body, dict) else None
+
+    @staticmethod
+    def _containers(params):
+        """(parent key, dict) pairs to search for paging fields: the params and dicts nested one level down."""
+        return [(None, params)] + [(k, v) for k, v in params.items() if isinstance(v, dict)]
+
+    def _paging(self, params):
+        """(parent key, key, style) of the page or offset parameter in `params`, or None."""
+        for style, keys in (("page", PAGE_KEYS), ("offset", OFFSET_KEYS)):
+            for parent, container in self._containers(params):
+                for key, value in container.items():
+                    if key.lower() in keys and str(value).isdigit():
+                        return parent, key, style
+        return None
+
+    def _page_size(self, params):
+        for _, container in self._containers(params):
+            for key, value in container.items():
+                if key.lower() in SIZE_KEYS and str(value).isdigit() and int(value) > 0:
+                    return int(value)
+        return len(self.items)
+
+    def paginates(self):
+        return self.page_request(1) is not None
+
+    def page_request(self, index):
+        """
+        (url, requests kwargs) for the page `index` pages after the captured
+        one, or None when no page/offset parameter was recognised.
+        """
+        parsed = urlparse(self.url)
+        query = dict(parse_qsl(parsed.query, keep_blank_values=True))
+        body = self._body()
+        params = body if body is not None else query
+        paging = self._paging(params)
+        if paging is None and body is not None:  # POST APIs sometimes page in the query string
+            body, params = None, query
+            paging = self._paging(params)
+        if paging is None:
+            return None
+
+        parent, key, style = paging
+        params = json.loads(json.dumps(params))  # deep copy; the captured request stays untouched
+        container = params if parent is None else params[parent]
+        step = 1 if style == "page" else self._page_size(params)
+        value = int(container[key]) + index * step
+        container[key] = value if isinstance(container[key], int) else str(value)
+
+        kwargs = {"headers": self.headers, "timeout": 20}
+        if body is not None:
+            return self.url, dict(kwargs, json=params)
+        if self.method != "GET" and self.post_data:
+            kwargs["data"] = self.post_data
+        return urlunparse(parsed._replace(query=urlencode(params))), kwargs
+
+
+class ApiCapture:
+    """
+    Collects JSON responses that look like job listings while a page renders.
+    Register `on_response` as the Playwright page's "response" listener,
+    `await wait()` after navigation, then take `best()`.
+    """
+
+    def __init__(self):
+        self.candidates = []
+        self._pending = []
+
+    def on_response(self, response):
+        request = response.request
+        if request.resource_type not in ("xhr", "fetch") or response.status != 200:
+            return
+        if "json" not in (response.headers.get("content-type") or ""):
+            return
+        self._pending.append(asyncio.ensure_future(self._inspect(response)))
+
+    async def _inspect(self, response):
+        try:
+            payload = await response.json()
+        except Exception:
+            return
+        request = response.request
+        found = find_job_list(payload, url=request.url)
+        if found:
+            self.candidates.append(CapturedApi(
+                request.url, request.method, request.post_data, await request.all_headers(), *found
+            ))
+
+    async def wait(self):
+        await asyncio.gather(*self._pending, return_exceptions=True)
+        self._pending = []
+
+    def best(self):
+        """The captured listing with the most jobs, preferring ones that can be paginated."""
+        if not self.candidates:
+            return None
+        return max(self.candidates, key=lambda api: (api.paginates(), len(api.items)))
+
+
+# --------------------------- #
+# ✅ Replaying it over HTTP
+# --------------------------- #
+def _job_key(job):
+    return normalize_url(job["apply_url"]) if job.get("apply_url") else f"{job['job_id']}|{job['title']}"
+
+
+def _enrich(session, limiter, job):
+    """Fill a job's missing description/location/date from its detail page over plain HTTP."""
+    try:
+        res = fetch(session, job["apply_url"], limiter, timeout=20)
+        if res.status_code != 200:
+            return job
+        details = extract_job_details(make_soup(res.text), job["apply_url"])
+    except Exception as e:
+        print(f"⚠️ Could not fetch details for {job['apply_url']}: {e}", file=sys.stderr)
+        return job
+    for field in ("description", "location", "date_posted"):
+        if not job.get(field) or job[field] == "N/A":
+            job[field] = details.get(field) or job.get(field)
+    job["enriched"] = True
+    return job
+
+
+def iter_api_jobs(api, base_url, company, skills, max_jobs=10, max_pages=5, state=None, prefilter=False,
+                  enrich=True, cookies=None, workers=4):
+    """
+    Yield matching jobs from a captured listing API: the captured page first,
+    then following pages requested directly over HTTP by stepping its
+    page/offset parameter, until a page is empty, repeats itself, or the
+    limits are reached. Listings without a description get it from their
+    detail page (HTTP, `workers` at a time) when `enrich` is set; with
+    `prefilter` only listings whose title/location/URL match are fetched.
+    With a CrawlState, unchanged jobs are skipped and paging stops at the
+    first page of only seen jobs.
+    """
+    matcher = SkillMatcher(skills)
+    session = make_session(pool_size=workers)
+    if cookies:
+        session.cookies.update(cookies)
+    limiter = HostLimiter(max_per_host=workers)
+    collected = 0
+    seen = set()
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for index in range(max_pages):
+                if collected >= max_jobs:
+                    break
+                if index == 0:
+                    items = api.items
+                else:
+                    request = api.page_request(index)
+                    if request is None:
+                        break
+                    url, kwargs = request
+                    print(f"🌀 [{company}] Fetching API page {index + 1} ...", file=sys.stderr)
+                    res = fetch(session, url, limiter, method=api.method, **kwargs)
+                    if res.status_code != 200:
+                        print(f"⚠️ API page {index + 1} failed (status {res.status_code})", file=sys.stderr)
+                        break
+                    items = items_at(res.json(), api.path)
+
+                jobs = [item_to_job(item, base_url, company) for item in items if isinstance(item, dict)]
+                jobs = [job for job in jobs if _job_key(job) not in seen]
+                if not jobs:
+                    print(f"⏹️ API page {index + 1} has no new jobs. Stopping.", file=sys.stderr)
+                    break
+                seen.update(_job_key(job) for job in jobs)
+
+                already_seen = 0
+                pending = []
+                digests = {}  # recorded once a job is judged, not when cut off by max_jobs
+                for job in jobs:
+                    link = job["apply_url"]
+                    if state is not None and link:
+                        digest = content_hash(job["title"], job["location"], job["description"])
+                        if state.is_unchanged(link, digest):
+                            state.touch(link)
+                            already_seen += 1
+                            continue
+                        digests[link] = digest
+                    needs_details = not job["description"] and link
+                    if matcher and needs_details and (prefilter or not enrich):
+                        # Cheap stage: only fetch details for listings that already look like a match
+                        if not matcher.matches(job["title"], job["location"], urlparse(link).path):
+                            if link in digests:
+                                state.record(link, job["job_id"], digests[link])
+                            continue
+                    job["enriched"] = not needs_details
+                    pending.append(job)
+
+                to_enrich = [job for job in pending if enrich and not job["enriched"]]
+                list(executor.map(lambda job: _enrich(session, limiter, job), to_enrich))
+
+                for job in pending:
+                    if collected >= max_jobs:
+                        break
+                    if job["apply_url"] in digests:
+                        state.record(job["apply_url"], job["job_id"], digests[job["apply_url"]])
+                    if job["enriched"]:
+                        job["matched_skills"] = matcher.find(job["title"], job["description"])
+                    else:  # a stub: judged on its listing fields, as the prefilter did
+                        job["matched_skills"] = matcher.find(job["title"], job["location"], urlparse(job["apply_url"]).path)
+                    if not matcher or job["matched_skills"]:
+                        collected += 1
+                        yield job
+
+                print(f"✅ [{company}] API page {index + 1} done — total jobs: {collected}", file=sys.stderr)
+                if state is not None and already_seen == len(jobs):
+                    print(f"⏹️ API page {index + 1} only has already-seen jobs. Stopping.", file=sys.stderr)
+                    break
+    finally:
+        session.close()
@@ -2,9 +2,18 @@ import subprocess
 import sys
 import json
 import re
-import requests
 import html
-from bs4 import BeautifulSoup
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from .html_backend import html_to_text, make_soup, only, select_first_text
+from .extractors import extract_job_details
+from . import http_cache
+from .fetcher import HostLimiter, fetch, make_session
+from .worker_client import get_worker_pool
+from .crawl_state import DEFAULT_STATE_PATH, CrawlState, content_hash, crawl_scope
+from .skills import SkillMatcher
 
 
 # --------------------------- #
@@ -14,203 +23,534 @@ def clean_html(raw_html: str) -> str:
     """Convert HTML job description to clean text."""
     if not raw_html:
         return ""
-    decoded = html.unescape(raw_html)
-    soup = BeautifulSoup(decoded, "html.parser")
-    text = soup.get_text(separator=" ", strip=True)
-    return " ".join(text.split())
+    return html_to_text(html.unescape(raw_html))
 
 
 # --------------------------- #
 # ✅ Capgemini API Scraper (KEEPED)
 # --------------------------- #
-def crawl_capgemini_api(start_url, skills, max_jobs=10, max_pages=10):
-    """Fetches jobs directly from Capgemini's internal API endpoint."""
-    print("🔍 Detected Capgemini URL — using API endpoint.")
-    API_URL = "https://cg-job-search-microservices.azurewebsites.net/api/job-search"
-    HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; JobScraper/1.0)"}
+CAPGEMINI_API_URL = "https://cg-job-search-microservices.azurewebsites.net/api/job-search"
 
-    all_jobs = []
-    page = 1
-    country_code = "in-en"
-    size = 50  # jobs per page
 
-    while page <= max_pages and len(all_jobs) < max_jobs:
-        params = {"page": page, "size": size, "country_code": country_code}
+def _fetch_capgemini_page(session, page, size=50, country_code="in-en", limiter=None):
+    """Fetch one page of the Capgemini job-search API and return its job list."""
+    params = {"page": page, "size": size, "country_code": country_code}
+    response = fetch(session, CAPGEMINI_API_URL, limiter, params=params, timeout=15)
+    response.raise_for_status()
+    return response.json().get("data", [])
+
 
+def _iter_capgemini_pages(session, max_pages, concurrency, limiter=None):
+    """
+    Yield (page, jobs) in page order while keeping up to `concurrency`
+    requests in flight. The consumer stops the crawl by closing the generator.
+    """
+    if concurrency <= 1:
+        for page in range(1, max_pages + 1):
+            yield page, _fetch_capgemini_page(session, page, limiter=limiter)
+        return
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        in_flight = deque()
+        next_page = 1
         try:
-            response = requests.get(API_URL, headers=HEADERS, params=params, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-        except Exception as e:
-            print(f"❌ Error fetching page {page}: {e}")
-            break
-
-        jobs = data.get("data", [])
-        if not jobs:
-            print(f"⚠️ No jobs found after page {page}. Stopping.")
-            break
-
-        for job in jobs:
-            if len(all_jobs) >= max_jobs:
+            while in_flight or next_page <= max_pages:
+                while len(in_flight) < concurrency and next_page <= max_pages:
+                    in_flight.append((next_page, pool.submit(_fetch_capgemini_page, session, next_page, limiter=limiter)))
+                    next_page += 1
+                page, future = in_flight.popleft()
+                yield page, future.result()
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+
+
+def iter_capgemini_api(start_url, skills, max_jobs=10, max_pages=10, concurrency=1, state=None):
+    """
+    Fetches jobs directly from Capgemini's internal API endpoint, yielding
+    each job as soon as it has been parsed and matched.
+    With concurrency > 1, up to that many API pages are fetched in parallel
+    over a shared keep-alive session; results are still consumed in page order.
+    With a CrawlState, jobs whose content is unchanged since the last crawl
+    are skipped and pagination stops at the first page of only seen jobs.
+    If the first page can't be fetched the error is raised; a later failure
+    ends the crawl with the jobs found so far.
+    """
+    print("🔍 Detected Capgemini URL — using API endpoint.")
+
+    collected = 0
+    pages_fetched = 0
+    first_job_at = None
+    matcher = SkillMatcher(skills)
+    started = time.perf_counter()
+    session = make_session(pool_size=max(concurrency, 1))
+    # No fixed rate for the API, but back off if it starts throttling or failing
+    limiter = HostLimiter(max_per_host=max(concurrency, 1))
+    pages = _iter_capgemini_pages(session, max_pages, concurrency, limiter)
+
+    try:
+        while collected < max_jobs:
+            try:
+                page, jobs = next(pages)
+            except StopIteration:
+                break
+            except Exception as e:
+                print(f"❌ Error fetching page {pages_fetched + 1}: {e}")
+                if pages_fetched == 0:
+                    raise
+                break
+            pages_fetched += 1
+
+            if not jobs:
+                print(f"⚠️ No jobs found after page {page}. Stopping.")
+                break
+
+            already_seen = 0
+            for job in jobs:
+                if collected >= max_jobs:
+                    break
+
+                if state is not None:
+                    job_key = job.get("apply_job_url") or f"capgemini:{job.get('id')}"
+                    digest = content_hash(job.get("title"), job.get("description"))
+                    if state.is_unchanged(job_key, digest):
+                        state.touch(job_key)
+                        already_seen += 1
+                        continue
+                    state.record(job_key, job.get("id"), digest)
+
+                description_text = clean_html(job.get("description", ""))
+                job_obj = {
+                    "job_id": job.get("id"),
+                    "title": job.get("title"),
+                    "brand": job.get("brand"),
+                    "contract_type": job.get("contract_type"),
+                    "experience_level": job.get("experience_level"),
+                    "professional_community": job.get("professional_communities"),
+                    "location": job.get("location"),
+                    "department": job.get("department"),
+                    "sbu": job.get("sbu"),
+                    "apply_url": job.get("apply_job_url"),
+                    "description": description_text,
+                }
+
+                job_obj["matched_skills"] = matcher.find(job_obj["title"], description_text)
+                if not matcher or job_obj["matched_skills"]:
+                    collected += 1
+                    if first_job_at is None:
+                        first_job_at = time.perf_counter() - started
+                    yield job_obj
+
+            print(f"✅ Page {page}: Collected {len(jobs)} jobs (total: {collected})")
+            if state is not None and already_seen == len(jobs):
+                print(f"⏹️ Page {page} only has already-seen jobs. Stopping.")
                 break
-            
-            description_text = clean_html(job.get("description", ""))
-            job_obj = {
-                "job_id": job.get("id"),
-                "title": job.get("title"),
-                "brand": job.get("brand"),
-                "contract_type": job.get("contract_type"),
-                "experience_level": job.get("experience_level"),
-                "professional_community": job.get("professional_communities"),
-                "location": job.get("location"),
-                "department": job.get("department"),
-                "sbu": job.get("sbu"),
-                "apply_url": job.get("apply_job_url"),
-                "description": description_text,
-            }
-
-            if not skills or any(s.lower() in description_text.lower() for s in skills):
-                all_jobs.append(job_obj)
-
-        print(f"✅ Page {page}: Collected {len(jobs)} jobs (total: {len(all_jobs)})")
-        page += 1
-
-    print(f"🎯 Total collected: {len(all_jobs)} Capgemini jobs.")
-    return all_jobs
+    finally:
+        pages.close()
+        session.close()
+
+        elapsed = time.perf_counter() - started
+        ttfj = f"{first_job_at:.2f}s" if first_job_at is not None else "n/a"
+        print(
+            f"⏱️ Capgemini (concurrency={concurrency}): {pages_fetched} pages in {elapsed:.2f}s "
+            f"({pages_fetched / elapsed if elapsed else 0:.2f} pages/sec), time-to-first-job {ttfj}"
+        )
+        print(f"🎯 Total collected: {collected} Capgemini jobs.")
+
+
+def crawl_capgemini_api(start_url, skills, max_jobs=10, max_pages=10, concurrency=1, state=None):
+    """List-returning wrapper around iter_capgemini_api."""
+    return list(iter_capgemini_api(start_url, skills, max_jobs, max_pages, concurrency, state))
 
 
 # --------------------------- #
 # ✅ Barclays Scraper (NEW)
 # --------------------------- #
-def crawl_barclays(start_url, skills, max_jobs=10, max_pages=5):
-    print("🔍 Detected Barclays URL — using static HTML scraper.")
-    HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; JobScraper/1.0)"}
+BARCLAYS_BASE_URL = "https://search.jobs.barclays"
 
-    all_jobs = []
-    page = 1
 
-    while page <= max_pages and len(all_jobs) < max_jobs:
-        # Barclays pagination uses CurrentPage in query string
-        if "CurrentPage=" in start_url:
-            url = re.sub(r"CurrentPage=\d+", f"CurrentPage={page}", start_url)
-        elif "?" in start_url:
-            url = f"{start_url}&CurrentPage={page}"
+def _parse_barclays_card(card):
+    """Pull title, link, location and posted date out of one listing card."""
+    title_tag = card.select_one(".job-title--link")
+    title = title_tag.get_text(strip=True) if title_tag else "N/A"
+    link = title_tag["href"] if title_tag and title_tag.has_attr("href") else None
+    if link and not link.startswith("http"):
+        link = f"{BARCLAYS_BASE_URL}{link}"
+
+    location_tag = card.select_one(".job-location")
+    location = location_tag.get_text(strip=True) if location_tag else "N/A"
+
+    date_tag = card.select_one(".job-date span")
+    date_posted = date_tag.get_text(strip=True) if date_tag else "N/A"
+
+    return {"title": title, "link": link, "location": location, "date_posted": date_posted}
+
+
+UNCHANGED = object()  # detail page not modified since the last crawl
+BARCLAYS_DESCRIPTION_SELECTOR = ".ats-description, .job-description, .ats-description__content"
+
+
+def _fetch_barclays_description(session, limiter, link, state=None, pending=None):
+    """
+    Fetch a Barclays detail page and return its cleaned description.
+    Returns "" when there is no link or the page is not 200, and None when
+    the request fails outright (the job is then skipped). With a CrawlState
+    the request is conditional, and UNCHANGED is returned on a 304 or when
+    the description hash matches the previous crawl. New or changed jobs are
+    recorded straight away, or put in the `pending` dict (link → record
+    arguments) when the caller records them once the job is judged.
+    """
+    if not link:
+        return ""
+    headers = state.conditional_headers(link) if state is not None else None
+    try:
+        job_res = fetch(session, link, limiter, headers=headers, timeout=15)
+    except Exception as e:
+        print(f"❌ Failed to fetch job description for {link}: {e}")
+        return None
+
+    if job_res.status_code == 304 and state is not None:
+        state.touch(link)
+        return UNCHANGED
+
+    if job_res.status_code != 200:
+        print(f"⚠️ Skipped job ({link}) — status {job_res.status_code}")
+        return ""
+
+    # Barclays job details are inside this section; only it is extracted
+    description_text = select_first_text(job_res.text, BARCLAYS_DESCRIPTION_SELECTOR) or ""
+
+    if state is not None:
+        digest = content_hash(description_text)
+        record = {"digest": digest, "etag": job_res.headers.get("ETag"),
+                  "last_modified": job_res.headers.get("Last-Modified")}
+        if state.is_unchanged(link, digest):
+            state.record(link, **record)
+            return UNCHANGED
+        if pending is None:
+            state.record(link, **record)
         else:
-            url = f"{start_url}?CurrentPage={page}"
+            pending[link] = record
+    return description_text
 
-        print(f"🌀 [Barclays] Fetching page {page} ...")
-        try:
-            response = requests.get(url, headers=HEADERS, timeout=20)
-            if response.status_code != 200:
-                print(f"⚠️ Barclays failed on page {page}: {response.status_code}")
-                break
 
-            soup = BeautifulSoup(response.text, "html.parser")
-            job_cards = soup.select(".list-item.list-item--card")
+def _lazy_barclays_description(card, state=None, pending=None):
+    """
+    Listing-only stand-in for _fetch_barclays_description: no request is made
+    and the description stays empty until enrich_job(). With a CrawlState the
+    card fields decide whether the job is new (`pending` as for
+    _fetch_barclays_description).
+    """
+    if state is not None and card["link"]:
+        digest = content_hash(card["title"], card["location"], card["date_posted"])
+        if state.is_unchanged(card["link"], digest):
+            state.touch(card["link"])
+            return UNCHANGED
+        if pending is None:
+            state.record(card["link"], digest=digest)
+        else:
+            pending[card["link"]] = {"digest": digest}
+    return ""
+
 
-            if not job_cards:
-                print("⚠️ No job cards found — possibly last page.")
-                break
+def iter_barclays(start_url, skills, max_jobs=10, max_pages=5,
+                  detail_workers=8, max_per_host=4, rate_per_host=5.0, state=None,
+                  prefilter=True, enrich=True):
+    """
+    Scrapes Barclays listing pages and yields jobs as they complete; detail
+    pages for each page of cards are fetched concurrently by
+    `detail_workers` threads over one pooled session, with at most
+    `max_per_host` requests in flight and `rate_per_host` request starts
+    per second. Job order follows the listing.
+    With `prefilter=True` the skill filter runs on the listing card (title,
+    location) first, so detail pages are only fetched for cards that match.
+    With `enrich=False` no detail page is fetched at all: jobs carry only the
+    card fields and `enriched: False`, and can be completed with enrich_job().
+    With a CrawlState, detail pages are revalidated with conditional requests,
+    unchanged jobs are skipped and pagination stops at a page of seen jobs.
+    A failure on the first listing page is raised; later ones end the crawl.
+    """
+    print("🔍 Detected Barclays URL — using static HTML scraper.")
+
+    collected = 0
+    page = 1
+    matcher = SkillMatcher(skills)
+    session = make_session(pool_size=max(detail_workers, 1))
+    limiter = HostLimiter(max_per_host=max_per_host, rate_per_host=rate_per_host)
+    pool = ThreadPoolExecutor(max_workers=max(detail_workers, 1))
 
-            for card in job_cards:
-                if len(all_jobs) >= max_jobs:
+    try:
+        while page <= max_pages and collected < max_jobs:
+            # Barclays pagination uses CurrentPage in query string
+            if "CurrentPage=" in start_url:
+                url = re.sub(r"CurrentPage=\d+", f"CurrentPage={page}", start_url)
+            elif "?" in start_url:
+                url = f"{start_url}&CurrentPage={page}"
+            else:
+                url = f"{start_url}?CurrentPage={page}"
+
+            print(f"🌀 [Barclays] Fetching page {page} ...")
+            try:
+                response = fetch(session, url, limiter, timeout=20)
+                if response.status_code != 200:
+                    print(f"⚠️ Barclays failed on page {page}: {response.status_code}")
+                    if page == 1:
+                        raise RuntimeError(f"Barclays listing returned HTTP {response.status_code}")
                     break
 
-                # Extract title and link
-                title_tag = card.select_one(".job-title--link")
-                title = title_tag.get_text(strip=True) if title_tag else "N/A"
-                link = title_tag["href"] if title_tag and title_tag.has_attr("href") else None
-                if link and not link.startswith("http"):
-                    link = f"https://search.jobs.barclays{link}"
-
-                # Extract location
-                location_tag = card.select_one(".job-location")
-                location = location_tag.get_text(strip=True) if location_tag else "N/A"
-
-                # Extract posted date
-                date_tag = card.select_one(".job-date span")
-                date_posted = date_tag.get_text(strip=True) if date_tag else "N/A"
-                description_text = ""
-                if link:
-                    try:
-                        job_res = requests.get(link, headers=HEADERS, timeout=15)
-                        if job_res.status_code == 200:
-                            job_soup = BeautifulSoup(job_res.text, "html.parser")
-                            # Barclays job details are inside this section
-                            desc_section = job_soup.select_one(".ats-description, .job-description, .ats-description__content")
-                        if desc_section:
-                                description_text = clean_html(desc_section.get_text())
-                        else:
-                            print(f"⚠️ Skipped job ({link}) — status {job_res.status_code}")
-                    except Exception as e:
-                        print(f"❌ Failed to fetch job description for {link}: {e}")
-                        continue
-                job = {
-                    "company": "Barclays",
-                    "title": title,
-                    "location": location,
-                    "date_posted": date_posted,
-                    "apply_url": link,
-                    "description": description_text,
-                }
+                soup = make_soup(response.text, parse_only=only(class_="list-item--card"))
+                job_cards = soup.select(".list-item.list-item--card")
 
-                # Filter by skill if provided
-                if not skills or any(s.lower() in title.lower() for s in skills):
-                    all_jobs.append(job)
+                if not job_cards:
+                    print("⚠️ No job cards found — possibly last page.")
+                    break
 
-            print(f"✅ [Barclays] Page {page} done — total jobs so far: {len(all_jobs)}")
-            page += 1
+                cards = [_parse_barclays_card(card) for card in job_cards]
+                if state is not None and all(card["link"] and state.is_seen(card["link"]) for card in cards):
+                    print(f"⏹️ Page {page} only has already-seen jobs. Stopping.")
+                    break
+                if matcher and (prefilter or not enrich):
+                    # Cheap stage: drop cards whose listing fields can't match before any detail fetch
+                    survivors = [card for card in cards if matcher.matches(card["title"], card["location"])]
+                    print(f"🔎 [Barclays] {len(survivors)}/{len(cards)} cards pass the listing filter")
+                    cards = survivors
+                if not matcher or prefilter or not enrich:
+                    # Every remaining card is kept, so don't fetch more than we need
+                    cards = cards[: max_jobs - collected]
+
+                # New jobs are only recorded once judged, not when cut off by max_jobs
+                pending = {}
+                if enrich:
+                    descriptions = pool.map(
+                        lambda card: _fetch_barclays_description(session, limiter, card["link"], state, pending),
+                        cards,
+                    )
+                else:
+                    descriptions = [_lazy_barclays_description(card, state, pending) for card in cards]
+
+                for card, description_text in zip(cards, descriptions):
+                    if collected >= max_jobs:
+                        break
+                    if description_text is None or description_text is UNCHANGED:
+                        continue
+                    if card["link"] in pending:
+                        state.record(card["link"], **pending.pop(card["link"]))
+
+                    job = {
+                        "company": "Barclays",
+                        "title": card["title"],
+                        "location": card["location"],
+                        "date_posted": card["date_posted"],
+                        "apply_url": card["link"],
+                        "description": description_text,
+                        "matched_skills": matcher.find(card["title"], card["location"], description_text),
+                        "enriched": enrich,
+                    }
+
+                    # Filter by skill if provided
+                    if not matcher or job["matched_skills"]:
+                        collected += 1
+                        yield job
+
+                print(f"✅ [Barclays] Page {page} done — total jobs so far: {collected}")
+                page += 1
+
+            except Exception as e:
+                print(f"❌ Error scraping Barclays page {page}: {e}")
+                if page == 1:
+                    raise
+                break
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        session.close()
+        print(f"🎯 Total collected: {collected} Barclays jobs.")
 
-        except Exception as e:
-            print(f"❌ Error scraping Barclays page {page}: {e}")
-            break
 
-    print(f"🎯 Total collected: {len(all_jobs)} Barclays jobs.")
-    return all_jobs
+def crawl_barclays(start_url, skills, max_jobs=10, max_pages=5, **kwargs):
+    """List-returning wrapper around iter_barclays."""
+    return list(iter_barclays(start_url, skills, max_jobs, max_pages, **kwargs))
 
 
 # --------------------------- #
-# ✅ Main Dispatcher
+# ✅ Lazy enrichment
 # --------------------------- #
-def crawl_jobs(start_url, skills, max_jobs=10, max_pages=3):
+def enrich_job(job, skills=None, session=None):
     """
-    Smart job crawler:
-    - Capgemini → API-based
-    - Barclays → HTML-based
-    - Others → Playwright worker
+    Fetch the detail page of a job crawled with enrich=False and fill in its
+    description (and matched_skills, when `skills` is given). Jobs that are
+    already enriched are returned as they are; on a failed request the job
+    stays unenriched so it can be retried. Updates and returns `job`.
     """
-    if "capgemini.com" in start_url:
-        return crawl_capgemini_api(start_url, skills, max_jobs, max_pages)
+    link = job.get("apply_url") or job.get("application_link")
+    if job.get("enriched", True) or not link:
+        return job
 
-    elif "barclays" in start_url:
-        return crawl_barclays(start_url, skills, max_jobs, max_pages)
+    own_session = session is None
+    session = session or make_session(pool_size=1)
+    try:
+        if detect_company(link) == "barclays":
+            description = _fetch_barclays_description(session, None, link)
+        else:
+            try:
+                response = fetch(session, link, timeout=15)
+            except Exception as e:
+                print(f"❌ Failed to fetch job description for {link}: {e}")
+                return job
+            if response.status_code != 200:
+                print(f"⚠️ Could not enrich job ({link}) — status {response.status_code}")
+                return job
+            description = extract_job_details(make_soup(response.text), link)["description"]
+    finally:
+        if own_session:
+            session.close()
+
+    if description is None:
+        return job
+    job["description"] = description
+    job["enriched"] = True
+    if skills is not None:
+        job["matched_skills"] = SkillMatcher(skills).find(job.get("title"), job.get("location"), description)
+    return job
+
+
+def enrich_jobs(jobs, skills=None, workers=8):
+    """Enrich many jobs concurrently over one pooled session; returns how many were enriched."""
+    pending = [job for job in jobs if not job.get("enriched", True)]
+    if not pending:
+        return 0
+    session = make_session(pool_size=max(workers, 1))
+    try:
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            list(pool.map(lambda job: enrich_job(job, skills, session), pending))
+    finally:
+        session.close()
+    return sum(1 for job in pending if job.get("enriched"))
 
-    # ✅ Fallback for all other URLs (like Syngenta)
+
+# --------------------------- #
+# ✅ Main Dispatcher
+# --------------------------- #
+def detect_company(start_url):
+    """Company (and Chroma collection) name for a career-site URL."""
+    url = start_url.lower()
+    return (
+        "capgemini" if "capgemini.com" in url
+        else "barclays" if "barclays" in url
+        else "syngenta" if "syngenta" in url
+        else "unknown"
+    )
+
+
+def _iter_subprocess(params):
+    """
+    Run the Playwright worker once in a fresh process (cold start every call)
+    and yield the jobs it streams back as NDJSON on stdout.
+    """
     args = [
         sys.executable,
         "-m",
         "job_scraper.run_playwright_worker",
-        json.dumps(
-            {
-                "url": start_url,
-                "skills": skills,
-                "max_jobs": max_jobs,
-                "max_pages": max_pages,
-            }
-        ),
+        json.dumps(params),
     ]
-    out = subprocess.run(args, capture_output=True, text=True)
+    proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    # Drain stderr in the background so a chatty worker can't block on a full pipe
+    stderr_lines = []
+    stderr_reader = threading.Thread(target=lambda: stderr_lines.extend(proc.stderr), daemon=True)
+    stderr_reader.start()
 
-    if out.returncode != 0:
-        print("❌ Subprocess failed:\n", out.stderr)
-        return []
+    try:
+        for line in proc.stdout:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print("⚠️ Could not decode worker output:\n", line)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        stderr_reader.join(timeout=5)
+
+    if proc.returncode != 0:
+        print("❌ Subprocess failed:\n", "".join(stderr_lines))
+        raise RuntimeError(f"Playwright worker exited with status {proc.returncode}")
+
+
+def iter_crawl_jobs(start_url, skills, max_jobs=10, max_pages=3, concurrency=1, persistent=True,
+                    block_resources=False, incremental=False, state_path=DEFAULT_STATE_PATH,
+                    prefilter=None, enrich=True, api_capture=True, worker_pool=None):
+    """
+    Smart job crawler, yielding jobs as they are extracted:
+    - Capgemini → API-based
+    - Barclays → HTML-based
+    - Others → Playwright worker
+    `concurrency` sets how many pages are fetched in parallel where supported
+    (API pages for Capgemini, browser tabs for the Playwright worker).
+    `block_resources` stops the browser loading images, fonts and stylesheets.
+    With `persistent=True` the Playwright crawls go to a resident worker that
+    keeps a warm browser; `persistent=False` spawns a fresh process per call.
+    With `incremental=True` only new or changed jobs are returned, using the
+    seen-job index at `state_path`.
+    Where jobs need a detail page per job (Barclays, browser crawls),
+    `prefilter=True` applies the skill filter to listing fields first and
+    `enrich=False` skips detail pages entirely (see enrich_job). By default
+    (None) only Barclays prefilters, since it always filtered on the card
+    title; browser crawls match skills against the full description unless
+    `prefilter=True`, which misses jobs whose link text doesn't name a skill.
+    With `api_capture=True` browser crawls replay the site's own JSON listing
+    API over HTTP when one is seen during the first render.
+    Persistent Playwright crawls run on `worker_pool` (default: the
+    process-wide pool from get_worker_pool()).
+    A crawl that fails outright (first page, or the Playwright worker)
+    raises, so callers can tell a failure from an empty result.
+    """
+    if "capgemini.com" in start_url or "barclays" in start_url:
+        prefilter = True if prefilter is None else prefilter
+        state = None
+        if incremental:
+            # Capgemini filters whole API records; Barclays also depends on how cards are prefiltered
+            scope = (crawl_scope(skills) if "capgemini.com" in start_url
+                     else crawl_scope(skills, prefilter, enrich))
+            state = CrawlState(state_path, scope)
+        try:
+            if "capgemini.com" in start_url:
+                yield from iter_capgemini_api(start_url, skills, max_jobs, max_pages, concurrency, state=state)
+            else:
+                yield from iter_barclays(
+                    start_url, skills, max_jobs, max_pages, state=state, prefilter=prefilter, enrich=enrich
+                )
+        finally:
+            if state is not None:
+                state.close()
+        return
 
-    if not out.stdout.strip():
-        print("⚠️ Worker returned no JSON. STDERR:\n", out.stderr)
-        return []
+    # ✅ Fallback for all other URLs (like Syngenta)
+    params = {
+        "url": start_url,
+        "skills": skills,
+        "max_jobs": max_jobs,
+        "max_pages": max_pages,
+        "page_pool_size": concurrency,
+        "block_resources": block_resources,
+        "state_path": state_path if incremental else None,
+        "prefilter": bool(prefilter),
+        "enrich": enrich,
+        "api_capture": api_capture,
+        # A resident worker keeps the environment it started with, so the cache settings go with each crawl
+        "http_cache": http_cache.settings(),
+    }
+    if not persistent:
+        yield from _iter_subprocess(params)
+        return
 
     try:
-        return json.loads(out.stdout)
-    except json.JSONDecodeError:
-        print("⚠️ Could not decode worker output:\n", out.stdout)
-        return []
+        yield from (worker_pool or get_worker_pool()).iter_crawl(params)
+    except Exception as e:
+        print(f"❌ Playwright worker failed: {e}")
+        raise
+
+
+def crawl_jobs(*args, **kwargs):
+    """List-returning wrapper around iter_crawl_jobs (same arguments)."""
+    return list(iter_crawl_jobs(*args, **kwargs))
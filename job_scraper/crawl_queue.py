@@ -0,0 +1,448 @@
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+DEFAULT_QUEUE_PATH = "./crawl_queue.sqlite3"
+
+# queued → running → (crawled → indexing →) done, or failed / cancelled
+ACTIVE_STATUSES = ("queued", "running", "crawled", "indexing")
+FINAL_STATUSES = ("done", "failed", "cancelled")
+_COLUMNS = (
+    "id", "status", "params", "company", "submitted_at", "started_at", "finished_at", "heartbeat", "worker",
+    "extracted", "max_jobs", "stored", "duplicates", "message", "error", "exports", "cancel_requested",
+)
+
+
+class CrawlCancelled(Exception):
+    """Raised inside a worker when the crawl it is running was cancelled."""
+
+
+# --------------------------- #
+# ✅ SQLite-backed crawl queue
+# --------------------------- #
+class CrawlQueue:
+    """
+    Crawl requests shared between the UI and the worker processes through
+    one SQLite file. Each crawl has an ID, a status, progress counters
+    (jobs extracted / stored / duplicates, last message) and a cancel flag
+    that workers check between jobs. Safe to use from several threads and
+    processes at once.
+    """
+
+    def __init__(self, path=DEFAULT_QUEUE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS crawls (
+                    id TEXT PRIMARY KEY,
+                    status TEXT,
+                    params TEXT,
+                    company TEXT,
+                    submitted_at REAL,
+                    started_at REAL,
+                    finished_at REAL,
+                    heartbeat REAL,
+                    worker TEXT,
+                    extracted INTEGER DEFAULT 0,
+                    max_jobs INTEGER,
+                    stored INTEGER DEFAULT 0,
+                    duplicates INTEGER DEFAULT 0,
+                    message TEXT DEFAULT '',
+                    error TEXT,
+                    exports TEXT DEFAULT '[]',
+                    cancel_requested INTEGER DEFAULT 0,
+                    jobs TEXT
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS crawls_status ON crawls (status, submitted_at)")
+
+    def _row(self, row):
+        crawl = dict(zip(_COLUMNS, row))
+        crawl["params"] = json.loads(crawl["params"])
+        crawl["exports"] = json.loads(crawl["exports"] or "[]")
+        crawl["cancel_requested"] = bool(crawl["cancel_requested"])
+        return crawl
+
+    # ---- UI side ----
+    def submit(self, params):
+        """
+        Queue a crawl. `params` holds iter_crawl_jobs arguments (`url`,
+        `skills`, `max_jobs`, ...) plus `export` (formats), `store` (index
+        into ChromaDB) and `cache`/`offline` (HTTP response cache). Returns its ID.
+        """
+        # Imported here so workers and the CLI don't pay for the crawler imports just to submit
+        from .core import detect_company
+        crawl_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO crawls (id, status, params, company, submitted_at, max_jobs) VALUES (?, ?, ?, ?, ?, ?)",
+                (crawl_id, "queued", json.dumps(params), detect_company(params["url"]), time.time(),
+                 int(params.get("max_jobs", 10))),
+            )
+        return crawl_id
+
+    def get(self, crawl_id):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM crawls WHERE id = ?", (crawl_id,)
+            ).fetchone()
+        return self._row(row) if row else None
+
+    def list(self, limit=20, statuses=None):
+        """Most recent crawls first, optionally only those in `statuses`."""
+        query = f"SELECT {', '.join(_COLUMNS)} FROM crawls"
+        params = []
+        if statuses:
+            query += f" WHERE status IN ({','.join('?' * len(statuses))})"
+            params.extend(statuses)
+        query += " ORDER BY submitted_at DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(query, [*params, limit]).fetchall()
+        return [self._row(row) for row in rows]
+
+    def jobs(self, crawl_id):
+        """The jobs a crawl extracted (saved when its crawl stage ends)."""
+        with self._lock:
+            row = self._conn.execute("SELECT jobs FROM crawls WHERE id = ?", (crawl_id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else []
+
+    def cancel(self, crawl_id):
+        """A queued crawl is cancelled at once; a running one stops at its next job."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE crawls SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'",
+                (time.time(), crawl_id),
+            )
+            self._conn.execute(
+                "UPDATE crawls SET cancel_requested = 1 WHERE id = ? AND status = 'running'", (crawl_id,)
+            )
+
+    # ---- worker side ----
+    def _claim(self, from_status, to_status, worker):
+        """Atomically move the oldest crawl in `from_status` to `to_status`."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id FROM crawls WHERE status = ? ORDER BY submitted_at LIMIT 1", (from_status,)
+                ).fetchone()
+                if row is not None:
+                    now = time.time()
+                    self._conn.execute(
+                        "UPDATE crawls SET status = ?, worker = ?, heartbeat = ?, "
+                        "started_at = COALESCE(started_at, ?) WHERE id = ?",
+                        (to_status, worker, now, now, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self.get(row[0]) if row else None
+
+    def claim(self, worker):
+        """Next queued crawl, now marked running for `worker`, or None."""
+        return self._claim("queued", "running", worker)
+
+    def claim_ingest(self, worker):
+        """Next crawled-but-not-indexed crawl, now marked indexing, or None."""
+        return self._claim("crawled", "indexing", worker)
+
+    def progress(self, crawl_id, extracted, message=""):
+        """Record progress and return whether the crawl has been cancelled."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE crawls SET extracted = ?, message = ?, heartbeat = ? WHERE id = ?",
+                (extracted, message, time.time(), crawl_id),
+            )
+            row = self._conn.execute("SELECT cancel_requested FROM crawls WHERE id = ?", (crawl_id,)).fetchone()
+        return bool(row and row[0])
+
+    def beat(self, crawl_id):
+        with self._lock:
+            self._conn.execute("UPDATE crawls SET heartbeat = ? WHERE id = ?", (time.time(), crawl_id))
+
+    def finish_crawl(self, crawl_id, status, jobs, exports=(), error=None):
+        """
+        End the crawl stage: `crawled` (awaiting indexing), `done`, `failed`
+        or `cancelled`. Only a still-running crawl is updated (it may have
+        been failed as stale meanwhile); returns whether it was.
+        """
+        finished_at = None if status == "crawled" else time.time()
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE crawls SET status = ?, extracted = ?, jobs = ?, exports = ?, error = ?, finished_at = ?, "
+                "heartbeat = ? WHERE id = ? AND status = 'running'",
+                (status, len(jobs), json.dumps(jobs, default=str), json.dumps(list(exports)), error,
+                 finished_at, time.time(), crawl_id),
+            ).rowcount > 0
+
+    def finish_ingest(self, crawl_id, stored=0, duplicates=0, error=None):
+        """End indexing as `done` or `failed`, if the crawl is still indexing; returns whether it was."""
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE crawls SET status = ?, stored = ?, duplicates = ?, error = ?, finished_at = ? "
+                "WHERE id = ? AND status = 'indexing'",
+                ("failed" if error else "done", stored, duplicates, error, time.time(), crawl_id),
+            ).rowcount > 0
+
+    def fail_stale(self, timeout=900, ingest_timeout=3600):
+        """
+        Recover crawls whose process died: running crawls silent for
+        `timeout` seconds fail, indexing ones go back to `crawled` to be
+        indexed again (their jobs are saved), and crawled ones no ingest
+        thread has picked up within `ingest_timeout` seconds fail.
+        Returns how many crawls were changed.
+        """
+        now = time.time()
+        with self._lock:
+            changed = self._conn.execute(
+                "UPDATE crawls SET status = 'failed', error = 'worker stopped responding', finished_at = ? "
+                "WHERE status = 'running' AND heartbeat < ?",
+                (now, now - timeout),
+            ).rowcount
+            changed += self._conn.execute(
+                "UPDATE crawls SET status = 'crawled', worker = NULL, heartbeat = ? "
+                "WHERE status = 'indexing' AND heartbeat < ?",
+                (now, now - timeout),
+            ).rowcount
+            changed += self._conn.execute(
+                "UPDATE crawls SET status = 'failed', error = 'not indexed: no ingest worker picked it up', "
+                "finished_at = ? WHERE status = 'crawled' AND heartbeat < ?",
+                (now, now - ingest_timeout),
+            ).rowcount
+        return changed
+
+    def fail_worker(self, worker, error="worker stopped"):
+        """Fail the crawls `worker` was running (it was stopped or killed)."""
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE crawls SET status = 'failed', error = ?, finished_at = ? WHERE status = 'running' AND worker = ?",
+                (error, time.time(), worker),
+            ).rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# --------------------------- #
+# ✅ Workers
+# --------------------------- #
+def _heartbeat(queue, crawl_id, stop, interval=30):
+    # Keeps a crawl that goes minutes without a matching job (or a long indexing run) from looking dead
+    while not stop.wait(interval):
+        queue.beat(crawl_id)
+
+
+def run_crawl(queue, crawl, worker, progress_interval=0.5):
+    """
+    Crawl and export one claimed crawl, streaming progress to the queue.
+    Indexing is left to the ingest thread (status `crawled`) when requested.
+    The crawl's cache/offline flags apply to this process and, through the
+    crawl request, to its resident Playwright worker, which is shared by
+    every crawl this process runs.
+    """
+    from .core import iter_crawl_jobs
+    from .exporters import open_exporters
+    from . import http_cache
+
+    params = dict(crawl["params"])
+    export, store = params.pop("export", []), params.pop("store", True)
+    cache, offline = params.pop("cache", False), params.pop("offline", False)
+    # iter_crawl_jobs sends the resulting settings along with each Playwright crawl
+    if cache or offline:
+        http_cache.enable(offline=offline)
+    else:
+        http_cache.disable()
+
+    jobs, exporter, reported = [], None, 0.0
+    beating = threading.Event()
+    threading.Thread(target=_heartbeat, args=(queue, crawl["id"], beating), daemon=True).start()
+    try:
+        exporter = open_exporters(export, crawl["company"])
+        for job in iter_crawl_jobs(
+            params.pop("url"), params.pop("skills", []), int(params.pop("max_jobs", 10)),
+            int(params.pop("max_pages", 3)), **params,
+        ):
+            jobs.append(job)
+            exporter.write(job)
+            if time.monotonic() - reported >= progress_interval:
+                reported = time.monotonic()
+                if queue.progress(crawl["id"], len(jobs), job.get("title") or ""):
+                    raise CrawlCancelled()
+        if queue.progress(crawl["id"], len(jobs), "crawl finished"):
+            raise CrawlCancelled()
+    except CrawlCancelled:
+        print(f"🛑 Crawl {crawl['id']} cancelled after {len(jobs)} jobs.", file=sys.stderr)
+        queue.finish_crawl(crawl["id"], "cancelled", jobs, exporter.paths if exporter else ())
+        return
+    except Exception as e:
+        print(f"❌ Crawl {crawl['id']} failed: {e}", file=sys.stderr)
+        queue.finish_crawl(crawl["id"], "failed", jobs, exporter.paths if exporter else (), error=str(e))
+        return
+    finally:
+        beating.set()
+        if exporter is not None:
+            exporter.close()
+
+    status = "crawled" if store and jobs else "done"
+    if not queue.finish_crawl(crawl["id"], status, jobs, [path for path in exporter.paths if os.path.exists(path)]):
+        print(f"⚠️ Crawl {crawl['id']} was already marked failed; its results were not saved.", file=sys.stderr)
+        return
+    print(f"✅ Crawl {crawl['id']}: {len(jobs)} {crawl['company']} jobs ({worker}).", file=sys.stderr)
+
+
+def worker_main(path=DEFAULT_QUEUE_PATH, poll_interval=1.0, stop_event=None, parent_pid=None):
+    """
+    Worker loop: claim queued crawls and run them until `stop_event` is set
+    or, for a worker process, until the process that started it (`parent_pid`) exits.
+    """
+    queue = CrawlQueue(path)
+    worker = f"worker:{os.getpid()}"
+    idle_since = time.monotonic()
+    while stop_event is None or not stop_event.is_set():
+        if parent_pid is not None and os.getppid() != parent_pid:
+            break
+        crawl = queue.claim(worker)
+        if crawl is None:
+            if time.monotonic() - idle_since > 60:
+                queue.fail_stale()
+                idle_since = time.monotonic()
+            time.sleep(poll_interval)
+            continue
+        run_crawl(queue, crawl, worker)
+        idle_since = time.monotonic()
+
+
+def ingest_loop(path=DEFAULT_QUEUE_PATH, poll_interval=1.0, stop_event=None):
+    """
+    Index crawled jobs into ChromaDB. Runs as a single thread in the process
+    that owns the workers, because a persistent Chroma directory must not be
+    written by several processes at once.
+    """
+    from .db_manager import store_jobs
+
+    queue = CrawlQueue(path)
+    worker = f"ingest:{os.getpid()}"
+    while stop_event is None or not stop_event.is_set():
+        crawl = queue.claim_ingest(worker)
+        if crawl is None:
+            time.sleep(poll_interval)
+            continue
+        beating = threading.Event()
+        threading.Thread(target=_heartbeat, args=(queue, crawl["id"], beating), daemon=True).start()
+        try:
+            stats = store_jobs(crawl["company"], queue.jobs(crawl["id"]))
+            queue.finish_ingest(crawl["id"], stats["stored"], stats["duplicates"])
+        except Exception as e:
+            print(f"❌ Indexing crawl {crawl['id']} failed: {e}", file=sys.stderr)
+            queue.finish_ingest(crawl["id"], error=f"indexing failed: {e}")
+        finally:
+            beating.set()
+
+
+class CrawlWorkers:
+    """
+    `processes` crawl worker processes plus one ingest thread serving a
+    CrawlQueue. Workers are separate `python -m job_scraper.crawl_queue
+    --worker` processes (like the Playwright worker), so they never re-import
+    the caller's script; they exit with it. Dead ones are replaced by
+    `ensure_running()`.
+    """
+
+    def __init__(self, path=DEFAULT_QUEUE_PATH, processes=2, ingest=True):
+        self.path = path
+        self.processes = processes
+        self.ingest = ingest
+        self._stop = threading.Event()
+        self._workers = []
+        self._ingest_thread = None
+
+    def ensure_running(self):
+        self._workers = [p for p in self._workers if p.poll() is None]
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+        while len(self._workers) < self.processes:
+            self._workers.append(subprocess.Popen(
+                [sys.executable, "-m", "job_scraper.crawl_queue", "--worker", "--queue", self.path,
+                 "--parent-pid", str(os.getpid())],
+                env=env,
+            ))
+        if self.ingest and (self._ingest_thread is None or not self._ingest_thread.is_alive()):
+            self._ingest_thread = threading.Thread(
+                target=ingest_loop, args=(self.path,), kwargs={"stop_event": self._stop}, daemon=True
+            )
+            self._ingest_thread.start()
+        return self
+
+    def alive(self):
+        return sum(p.poll() is None for p in self._workers)
+
+    def stop(self, timeout=10):
+        """Stop the workers; crawls they were running are marked failed."""
+        self._stop.set()
+        queue = CrawlQueue(self.path)
+        for process in self._workers:
+            process.terminate()
+            try:
+                process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            queue.fail_worker(f"worker:{process.pid}")
+        queue.close()
+        if self._ingest_thread is not None:
+            self._ingest_thread.join(timeout)
+
+
+_workers = None
+_workers_lock = threading.Lock()
+
+
+def start_workers(path=DEFAULT_QUEUE_PATH, processes=2, ingest=True):
+    """Process-wide CrawlWorkers, started on first call and revived on later ones."""
+    global _workers
+    with _workers_lock:
+        if _workers is None:
+            _workers = CrawlWorkers(path, processes, ingest)
+        return _workers.ensure_running()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run crawl queue workers (and the ChromaDB ingest thread).")
+    parser.add_argument("--queue", default=DEFAULT_QUEUE_PATH, help="queue database path")
+    parser.add_argument("--processes", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="crawl worker processes")
+    parser.add_argument("--no-ingest", action="store_true",
+                        help="don't index into ChromaDB here (another process runs the ingest thread)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--parent-pid", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:  # one crawl worker process, started by CrawlWorkers
+        worker_main(args.queue, parent_pid=args.parent_pid)
+        return 0
+
+    workers = CrawlWorkers(args.queue, args.processes, ingest=not args.no_ingest).ensure_running()
+    print(f"👷 {args.processes} crawl workers serving {args.queue} (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(5)
+            workers.ensure_running()
+    except KeyboardInterrupt:
+        workers.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+import hashlib
+import sqlite3
+import threading
+import time
+
+# Lives next to ./chroma_db so a crawl host keeps its index and its state together
+DEFAULT_STATE_PATH = "./crawl_state.sqlite3"
+
+
+def content_hash(*parts):
+    """Stable hash of job content, insensitive to whitespace differences."""
+    normalized = "\x1f".join(" ".join(str(p or "").split()) for p in parts)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def crawl_scope(skills, prefilter=None, enrich=None):
+    """
+    State scope for a crawl's filter. A job rejected by one skill filter
+    must still be new to a crawl with another filter, so seen jobs are kept
+    per scope; crawls without skills see every job and share the "" scope.
+    """
+    skills = sorted({skill.strip().lower() for skill in skills or () if skill.strip()})
+    if not skills:
+        return ""
+    scope = "skills=" + ",".join(skills)
+    if prefilter is not None:
+        scope += f";prefilter={int(bool(prefilter))}"
+    if enrich is not None:
+        scope += f";enrich={int(bool(enrich))}"
+    return scope
+
+
+# --------------------------- #
+# ✅ Persistent seen-job index
+# --------------------------- #
+class CrawlState:
+    """
+    SQLite-backed record of every job URL seen by earlier crawls: its job id,
+    content hash, HTTP validators (ETag / Last-Modified) and when it was
+    first and last seen. Safe to share between threads of one process and
+    between processes (the Playwright worker opens its own handle).
+    Jobs are recorded under `scope` (see crawl_scope), so crawls with
+    different filters don't skip each other's jobs.
+    """
+
+    def __init__(self, path=DEFAULT_STATE_PATH, scope=""):
+        self.path = path
+        self.scope = scope
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS seen_jobs (
+                    url TEXT PRIMARY KEY,
+                    job_id TEXT,
+                    content_hash TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    first_seen REAL,
+                    last_seen REAL
+                )
+                """
+            )
+
+    def _key(self, url):
+        # Unscoped rows keep the bare URL, so state from unfiltered crawls stays valid
+        return f"{self.scope}\x1f{url}" if self.scope else url
+
+    def get(self, url):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM seen_jobs WHERE url = ?", (self._key(url),)).fetchone()
+        return dict(row) if row else None
+
+    def is_seen(self, url):
+        return self.get(url) is not None
+
+    def is_unchanged(self, url, digest):
+        row = self.get(url)
+        return row is not None and row["content_hash"] == digest
+
+    def conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since headers for a revalidating GET."""
+        row = self.get(url)
+        headers = {}
+        if row and row["etag"]:
+            headers["If-None-Match"] = row["etag"]
+        if row and row["last_modified"]:
+            headers["If-Modified-Since"] = row["last_modified"]
+        return headers
+
+    def record(self, url, job_id=None, digest=None, etag=None, last_modified=None):
+        """Insert or refresh a job; validators that are None keep their stored value."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO seen_jobs (url, job_id, content_hash, etag, last_modified, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    job_id = COALESCE(excluded.job_id, job_id),
+                    content_hash = COALESCE(excluded.content_hash, content_hash),
+                    etag = COALESCE(excluded.etag, etag),
+                    last_modified = COALESCE(excluded.last_modified, last_modified),
+                    last_seen = excluded.last_seen
+                """,
+                (self._key(url), None if job_id is None else str(job_id), digest, etag, last_modified, now, now),
+            )
+
+    def touch(self, url):
+        """Mark an unchanged job as seen in this crawl."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE seen_jobs SET last_seen = ? WHERE url = ?", (time.time(), self._key(url)))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
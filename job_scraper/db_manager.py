@@ -1,51 +1,547 @@
-import chromadb
-from chromadb.utils import embedding_functions
+import hashlib
+import os
+import threading
+import time
+from .cache import LRUCache
+from .lexical_index import LexicalIndex, reciprocal_rank_fusion
 
-# Initialize Chroma client (persistent)
-client = chromadb.PersistentClient(path="./chroma_db")
-embedding_fn = embedding_functions.DefaultEmbeddingFunction()
+# Chroma, the embedding model and numpy are loaded on first use, not at import,
+# so importing this module (every Streamlit rerun, every worker) stays cheap.
+CHROMA_PATH = "./chroma_db"
+_chroma_path = CHROMA_PATH
+_client = None
+_embedding_fn = None
+_lexical_index = None
+_init_lock = threading.Lock()
 
-def query_jobs(company_name=None, query_text=None, n_results=10, count_only=False):
+
+def get_client():
+    """Process-wide persistent Chroma client, opened on first use."""
+    global _client
+    if _client is None:
+        with _init_lock:
+            if _client is None:
+                import chromadb
+                _client = chromadb.PersistentClient(path=_chroma_path)
+    return _client
+
+
+def get_embedding_fn():
+    """
+    Process-wide embedding function, created on first use: MiniLM on a reused
+    ONNX session behind an on-disk cache keyed by document content (see
+    embeddings.py; JOB_SCRAPER_EMBEDDING picks the backend).
+    """
+    global _embedding_fn
+    if _embedding_fn is None:
+        with _init_lock:
+            if _embedding_fn is None:
+                from .embeddings import make_embedding_function
+                _embedding_fn = make_embedding_function()
+    return _embedding_fn
+
+
+def get_lexical_index():
+    """BM25 index over the same jobs, kept in the Chroma directory and written alongside it."""
+    global _lexical_index
+    if _lexical_index is None:
+        with _init_lock:
+            if _lexical_index is None:
+                os.makedirs(_chroma_path, exist_ok=True)
+                _lexical_index = LexicalIndex(os.path.join(_chroma_path, "lexical_index.sqlite3"))
+    return _lexical_index
+
+
+def warm_up():
+    """Open the client, embedding function and BM25 index now rather than on the first request."""
+    get_client()
+    get_embedding_fn()
+    get_lexical_index()
+
+
+def __getattr__(name):
+    # `db_manager.client`, `.embedding_fn` and `.lexical_index` keep working, created on first access
+    lazy = {"client": get_client, "embedding_fn": get_embedding_fn, "lexical_index": get_lexical_index}
+    if name in lazy:
+        return lazy[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def configure(path=None, embedding_function=None):
     """
-    Query jobs semantically or filter by company/keyword.
-    If count_only=True → returns number of matched jobs.
+    Point this module at another Chroma directory and/or embedding function
+    (used by the benchmarks). The function is used as given, without the
+    embedding cache. Cached handles, counts and results are dropped.
+    """
+    global _chroma_path, _client, _embedding_fn, _lexical_index, _collections_listed_at
+    if path is not None:
+        _chroma_path = path
+        _client = None
+        if _lexical_index is not None:
+            _lexical_index.close()
+        _lexical_index = None
+    if embedding_function is not None:
+        _embedding_fn = embedding_function
+    _collections.clear()
+    _collections_listed_at = 0.0
+    _other_model_collections.clear()
+    _count_cache.clear()
+    _dedup_indexes.clear()
+    _lexical_synced.clear()
+    _embedding_cache.clear()
+    _result_cache.clear()
+
+
+# Repeated queries skip the embedding model and the search itself.
+# Result keys carry each collection's write counter from the shared BM25 index,
+# so a write from any process (e.g. the crawl queue's ingest) invalidates them.
+_embedding_cache = LRUCache(maxsize=1024)
+_result_cache = LRUCache(maxsize=256, ttl=300)
+
+
+def cache_stats():
+    """Hit/miss counters for the query embedding and result caches."""
+    return {"query_embeddings": _embedding_cache.stats(), "query_results": _result_cache.stats()}
+
+
+def embed_query(query_text):
+    embedding = _embedding_cache.get(query_text)
+    if embedding is None:
+        embedding = get_embedding_fn().embed_query([query_text])[0]
+        _embedding_cache.put(query_text, embedding)
+    return embedding
+
+
+# --------------------------- #
+# ✅ Ingestion
+# --------------------------- #
+def stable_job_id(company_name, job):
+    """Deterministic Chroma ID so re-crawled jobs overwrite instead of duplicating."""
+    key = job.get("job_id") or job.get("apply_url") or job.get("application_link")
+    if not key:
+        key = f"{job.get('title', '')}|{job.get('location', '')}|{job.get('description', '')}"
+    return hashlib.sha1(f"{company_name.lower()}:{key}".encode("utf-8")).hexdigest()
+
+
+def _job_metadata(company_name, job, crawled_at):
+    """Flat metadata in the same shape the search side reads (title/url/location/company)."""
+    meta = {
+        "company": company_name.lower(),
+        "title": job.get("title") or "",
+        "url": job.get("apply_url") or job.get("application_link") or "",
+        "location": job.get("location") or "",
+        "crawled_at": crawled_at,
+    }
+    if job.get("date_posted"):
+        meta["date_posted"] = str(job["date_posted"])
+    if job.get("job_id"):
+        meta["job_id"] = str(job["job_id"])
+    if job.get("matched_skills"):
+        meta["skills"] = ", ".join(job["matched_skills"])
+    return meta
+
+
+def _embed_batch(documents):
+    # Module-level so it can run in a ProcessPoolExecutor as well as threads
+    return get_embedding_fn()(documents)
+
+
+# Near-duplicate indexes, seeded from each collection on its first write in this process
+_dedup_indexes = {}
+_dedup_lock = threading.Lock()
+
+
+def _dedup_index(collection, page_size=1000):
+    index = _dedup_indexes.get(collection.name)
+    if index is None:
+        from .dedup import JobDeduplicator  # numpy; only writers need it
+        index = JobDeduplicator()
+        offset = 0
+        while True:
+            batch = collection.get(limit=page_size, offset=offset, include=["documents", "metadatas"])
+            stored = [
+                {"title": meta.get("title"), "description": doc, "location": meta.get("location"), "url": meta.get("url")}
+                for doc, meta in zip(batch["documents"], batch["metadatas"])
+            ]
+            for job_id, job, signature in zip(batch["ids"], stored, index.signatures(stored)):
+                index.add(job, job_id, signature)
+            if len(batch["ids"]) < page_size:
+                break
+            offset += page_size
+        _dedup_indexes[collection.name] = index
+    return index
+
+
+def store_jobs(company_name, jobs, batch_size=256, executor=None, dedup=True):
+    """
+    Upsert crawled jobs into the `company_name` collection.
+    With `dedup=True`, jobs that repeat an already stored posting under a
+    different ID (same normalized URL, or near-identical title + description
+    at the same location) are dropped before anything is embedded.
+    Documents are embedded in batches of `batch_size`; pass a thread or
+    process pool as `executor` to embed several batches in parallel.
+    A collection records the embedding model it was created with; storing
+    into it with another model raises ValueError.
+    Returns {"stored", "duplicates", "seconds", "docs_per_sec"}.
+    """
+    started = time.perf_counter()
+    collection = get_client().get_or_create_collection(
+        company_name.lower(), embedding_function=get_embedding_fn(),
+        metadata={"embedding_model": _embedding_model()},
+    )
+    if not _same_embedding_model(collection):
+        raise ValueError(
+            f"Collection {collection.name!r} holds {_collection_model(collection)} embeddings, "
+            f"not {_embedding_model()}; store into another Chroma directory or switch JOB_SCRAPER_EMBEDDING back"
+        )
+    _collections[collection.name] = collection
+    crawled_at = int(time.time())
+
+    # Last occurrence wins, so a batch never carries duplicate IDs
+    by_id = {stable_job_id(company_name, job): job for job in jobs}
+    duplicates = 0
+    new = []
+    if dedup:
+        # Checked now, indexed only once the write below has succeeded
+        with _dedup_lock:
+            index = _dedup_index(collection)
+            new = index.check(list(by_id.values()), key=lambda job: stable_job_id(company_name, job))
+        duplicates = len(by_id) - len(new)
+        by_id = {job_id: job for job, job_id, _ in new}
+
+    records = {}
+    for job_id, job in by_id.items():
+        document = job.get("description") or job.get("title") or ""
+        records[job_id] = (document, _job_metadata(company_name, job, crawled_at))
+
+    ids = list(records)
+    batch_size = min(batch_size, get_client().get_max_batch_size())
+    batches = [ids[i:i + batch_size] for i in range(0, len(ids), batch_size)]
+    documents = [[records[i][0] for i in batch] for batch in batches]
+
+    embedded = executor.map(_embed_batch, documents) if executor else map(_embed_batch, documents)
+    for batch_ids, batch_docs, embeddings in zip(batches, documents, embedded):
+        collection.upsert(
+            ids=batch_ids,
+            documents=batch_docs,
+            metadatas=[records[i][1] for i in batch_ids],
+            embeddings=embeddings,
+        )
+    get_lexical_index().upsert(collection.name, ((i, records[i][0], records[i][1]) for i in ids))
+    # Only once the write is visible, so no query can cache pre-write results afterwards
+    _result_cache.clear()
+    if new:
+        with _dedup_lock:
+            for job, job_id, signature in new:
+                index.add(job, job_id, signature)
+
+    elapsed = time.perf_counter() - started
+    rate = len(ids) / elapsed if elapsed else 0.0
+    print(
+        f"📥 Stored {len(ids)} {company_name} jobs in {elapsed:.2f}s ({rate:.1f} docs/sec), "
+        f"skipped {duplicates} duplicates"
+    )
+    return {"stored": len(ids), "duplicates": duplicates, "seconds": elapsed, "docs_per_sec": rate}
+
+
+
+# --------------------------- #
+# ✅ Collection handles
+# --------------------------- #
+COLLECTION_LIST_TTL = 60  # seconds before re-listing collections (other processes may add some)
+
+_collections = {}
+_collections_listed_at = 0.0
+_other_model_collections = set()  # built with another embedding model; never searched
+
+
+def _embedding_model():
+    from .embeddings import embedding_model_id
+    return embedding_model_id(get_embedding_fn())
+
+
+def _collection_model(collection):
+    # Collections created before the model was recorded hold float MiniLM vectors
+    from .embeddings import FLOAT_MODEL_ID
+    return (collection.metadata or {}).get("embedding_model", FLOAT_MODEL_ID)
+
+
+def _same_embedding_model(collection):
+    return _collection_model(collection) == _embedding_model()
+
+
+def _get_collections(company_name=None):
     """
-    collections = client.list_collections()
+    Cached collection handles, narrowed to the company filter before any lookup.
+    Collections embedded with another model than the current one are skipped:
+    their vectors aren't comparable with this model's query vectors.
+    """
+    global _collections_listed_at
+    if not _collections or time.monotonic() - _collections_listed_at > COLLECTION_LIST_TTL:
+        for col_info in get_client().list_collections():
+            if col_info.name in _collections or col_info.name in _other_model_collections:
+                continue
+            collection = get_client().get_collection(col_info.name, embedding_function=get_embedding_fn())
+            if not _same_embedding_model(collection):
+                print(
+                    f"⚠️ Skipping collection {collection.name!r}: embedded with "
+                    f"{_collection_model(collection)}, not {_embedding_model()}"
+                )
+                _other_model_collections.add(collection.name)
+                continue
+            _collections[col_info.name] = collection
+        _collections_listed_at = time.monotonic()
+
+    if company_name:
+        return [col for name, col in _collections.items() if company_name.lower() in name.lower()]
+    return list(_collections.values())
+
+
+def build_where(location=None, since=None):
+    """
+    Chroma metadata filter for the search side.
+    `location` is one location or a list of them (exact match);
+    `since` is a unix timestamp matched against the ingestion time.
+    """
+    clauses = []
+    if location:
+        locations = [location] if isinstance(location, str) else list(location)
+        clauses.append({"location": {"$in": locations}})
+    if since is not None:
+        clauses.append({"crawled_at": {"$gte": int(since)}})
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def _to_result(doc, meta, collection_name, distance=None):
+    result = {
+        "company": meta.get("company", collection_name),
+        "title": meta.get("title", ""),
+        "location": meta.get("location", ""),
+        "url": meta.get("url", ""),
+        "preview": doc[:150] + "...",
+    }
+    if distance is not None:
+        result["distance"] = distance
+    return result
+
+
+# --------------------------- #
+# ✅ Lexical index
+# --------------------------- #
+_lexical_synced = set()
+
+
+def _lexical_collections(collections, page_size=1000):
+    """
+    Names of `collections`, after making sure each one's BM25 index matches
+    it. Collections written before the index existed (or by an older
+    version) are re-indexed from Chroma once per process.
+    """
+    for collection in collections:
+        if collection.name in _lexical_synced:
+            continue
+        if get_lexical_index().count(collection.name) != collection.count():
+            get_lexical_index().clear(collection.name)
+            offset = 0
+            while True:
+                batch = collection.get(limit=page_size, offset=offset, include=["documents", "metadatas"])
+                get_lexical_index().upsert(collection.name, zip(batch["ids"], batch["documents"], batch["metadatas"]))
+                if len(batch["ids"]) < page_size:
+                    break
+                offset += page_size
+        _lexical_synced.add(collection.name)
+    return [collection.name for collection in collections]
+
+
+def _locations(location):
+    if not location:
+        return None
+    return [location] if isinstance(location, str) else list(location)
+
+
+# --------------------------- #
+# ✅ Search
+# --------------------------- #
+SEARCH_MODES = ("hybrid", "semantic", "keyword")
+RRF_DEPTH = 50  # candidates taken from each ranking before fusion
+
+
+def _vector_search(collections, query_text, depth, where):
+    """[(key, result)] of the `depth` nearest jobs over all collections, closest first."""
+    query_embedding = embed_query(query_text)
+    hits = []
+    for collection in collections:
+        results = collection.query(
+            query_embeddings=[query_embedding],
+            n_results=depth,
+            where=where,
+            include=["documents", "metadatas", "distances"],
+        )
+        for job_id, doc, meta, distance in zip(
+            results["ids"][0], results["documents"][0], results["metadatas"][0], results["distances"][0]
+        ):
+            hits.append(((collection.name, job_id), _to_result(doc, meta, collection.name, distance)))
+    hits.sort(key=lambda hit: hit[1]["distance"])
+    return hits[:depth]
+
+
+def _keyword_search(collections, query_text, depth, location, since, offset=0):
+    """[(key, result)] of the best BM25 matches, best first; no embedding involved."""
+    hits = get_lexical_index().search(
+        query_text, _lexical_collections(collections), n_results=depth, offset=offset,
+        locations=_locations(location), since=since,
+    )
+    return [((hit["collection"], hit["id"]), _to_result(hit["document"], hit, hit["collection"])) for hit in hits]
+
+
+def query_jobs(company_name=None, query_text=None, n_results=10, count_only=False,
+               location=None, since=None, mode="hybrid", offset=0):
+    """
+    Query jobs by text or filter by company/keyword.
+    `mode` picks the ranking:
+      keyword  → BM25 over title/job ID/description/location/skills; every
+                 query word must match and nothing is embedded
+      semantic → nearest neighbours of the embedded query
+      hybrid   → both rankings fused with reciprocal rank fusion
+    The query is embedded once and run against each matching collection with
+    location/date filters pushed down as a Chroma `where`; the per-collection
+    top-k lists are merged into one global ranking, of which `n_results`
+    starting at `offset` are returned.
+    If count_only=True → returns the number of jobs matching the company /
+    location / date filters and the query words (see count_jobs).
+    """
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode {mode!r}; choose from {', '.join(SEARCH_MODES)}")
+    if count_only:
+        return count_jobs(company_name, location=location, since=since, query_text=query_text)
+
+    collections = _get_collections(company_name)
     if not collections:
         print("⚠️ No collections found in ChromaDB.")
         return []
 
-    matched_docs = []
-    for col_info in collections:
-        collection = client.get_collection(col_info.name, embedding_function=embedding_fn)
+    where = build_where(location, since)
+    cache_key = (
+        tuple(sorted(get_lexical_index().versions(c.name for c in collections).items())),
+        query_text,
+        n_results,
+        repr(where),
+        mode,
+        offset,
+    )
+    # Only text queries are cached; full listings would pin the whole corpus in memory
+    cached = _result_cache.get(cache_key) if query_text else None
+    if cached is not None:
+        return list(cached)
 
-        # If company filter is given, skip others
-        if company_name and company_name.lower() not in col_info.name.lower():
-            continue
+    if not query_text:
+        # Return all jobs if no query (use iter_jobs / get_jobs_page to stay lazy)
+        return list(iter_jobs(company_name, location=location, since=since))
 
-        # If query text is provided → semantic search
-        if query_text:
-            results = collection.query(query_texts=[query_text], n_results=n_results)
-            for doc, meta in zip(results["documents"][0], results["metadatas"][0]):
-                matched_docs.append({
-                    "company": meta.get("company", col_info.name),
-                    "title": meta.get("title", ""),
-                    "location": meta.get("location", ""),
-                    "url": meta.get("url", ""),
-                    "preview": doc[:150] + "..."
-                })
-        else:
-            # Return all jobs if no query
-            all_docs = collection.get()
-            for doc, meta in zip(all_docs["documents"], all_docs["metadatas"]):
-                matched_docs.append({
-                    "company": meta.get("company", col_info.name),
-                    "title": meta.get("title", ""),
-                    "location": meta.get("location", ""),
-                    "url": meta.get("url", ""),
-                    "preview": doc[:150] + "..."
-                })
+    depth = offset + n_results
+    if mode == "keyword":
+        matched_docs = [r for _, r in _keyword_search(collections, query_text, n_results, location, since, offset)]
+    elif mode == "semantic":
+        matched_docs = [r for _, r in _vector_search(collections, query_text, depth, where)][offset:]
+    else:
+        depth = max(depth, RRF_DEPTH)
+        keyword_hits = _keyword_search(collections, query_text, depth, location, since)
+        vector_hits = _vector_search(collections, query_text, depth, where)
+        by_key = dict(keyword_hits)
+        for key, result in vector_hits:
+            by_key[key] = dict(by_key.get(key, {}), **result)  # keeps the vector distance
+        fused = reciprocal_rank_fusion([[key for key, _ in keyword_hits], [key for key, _ in vector_hits]])
+        matched_docs = [dict(by_key[key], score=score) for key, score in fused[offset:offset + n_results]]
 
-    if count_only:
-        return len(matched_docs)
-    return matched_docs
+    _result_cache.put(cache_key, matched_docs)
+    return list(matched_docs)
+
+
+# --------------------------- #
+# ✅ Counting
+# --------------------------- #
+_count_cache = {}
+
+
+def count_jobs(company_name=None, location=None, since=None, query_text=None):
+    """
+    Number of stored jobs matching the filters, without loading documents.
+    With `query_text` it is the number of jobs containing every query word,
+    answered by the BM25 index. Unfiltered counts come straight from
+    collection.count(); filtered counts use an ID-only lookup cached per
+    collection version (the shared write counter plus current size, so
+    writes from any process invalidate it).
+    """
+    collections = _get_collections(company_name)
+    if query_text:
+        return get_lexical_index().count_matches(
+            query_text, _lexical_collections(collections), locations=_locations(location), since=since
+        )
+    where = build_where(location, since)
+    return sum(_count_collection(collection, where) for collection in collections)
+
+
+def _count_collection(collection, where):
+    size = collection.count()
+    if where is None:
+        return size
+
+    key = (collection.name, repr(where))
+    version = (get_lexical_index().versions([collection.name])[collection.name], size)
+    cached = _count_cache.get(key)
+    if cached is None or cached[0] != version:
+        cached = (version, len(collection.get(where=where, include=[])["ids"]))
+        _count_cache[key] = cached
+    return cached[1]
+
+
+# --------------------------- #
+# ✅ Browsing
+# --------------------------- #
+def iter_jobs(company_name=None, page_size=200, location=None, since=None):
+    """
+    Lazily yield every stored job matching the filters, reading each
+    collection `page_size` documents at a time with limit/offset.
+    """
+    where = build_where(location, since)
+    for collection in _get_collections(company_name):
+        offset = 0
+        while True:
+            batch = collection.get(
+                where=where, limit=page_size, offset=offset, include=["documents", "metadatas"]
+            )
+            for doc, meta in zip(batch["documents"], batch["metadatas"]):
+                yield _to_result(doc, meta, collection.name)
+            if len(batch["ids"]) < page_size:
+                break
+            offset += page_size
+
+
+def get_jobs_page(company_name=None, page=1, page_size=20, location=None, since=None):
+    """
+    One page of browse results across collections. Per-collection counts are
+    used to jump straight to the right collection and offset, so only the
+    requested page is read from Chroma.
+    """
+    where = build_where(location, since)
+    skip = (page - 1) * page_size
+    remaining = page_size
+    results = []
+    for collection in _get_collections(company_name):
+        size = _count_collection(collection, where)
+        if skip >= size:
+            skip -= size
+            continue
+
+        batch = collection.get(
+            where=where, limit=remaining, offset=skip, include=["documents", "metadatas"]
+        )
+        for doc, meta in zip(batch["documents"], batch["metadatas"]):
+            results.append(_to_result(doc, meta, collection.name))
+        remaining -= len(batch["ids"])
+        skip = 0
+        if remaining <= 0:
+            break
+    return results
@@ -0,0 +1,240 @@
+import re
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import numpy as np
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "ref", "referrer", "trk"}
+
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+_MASK = np.uint64(0xFFFFFFFF)
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize_url(url):
+    """
+    Canonical form of a job URL for exact-duplicate checks: no scheme, lower-case
+    host without "www.", no fragment, no tracking parameters, sorted query and
+    no trailing slash. Returns "" for an empty URL.
+    """
+    if not url:
+        return ""
+    parts = urlparse(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunparse(("", host, path, "", urlencode(query), ""))
+
+
+def unique_urls(urls):
+    """`urls` without repeats of the same normalized URL, first occurrence kept, order preserved."""
+    seen = set()
+    unique = []
+    for url in urls:
+        key = normalize_url(url)
+        if key not in seen:
+            seen.add(key)
+            unique.append(url)
+    return unique
+
+
+def _job_url(job):
+    return job.get("apply_url") or job.get("application_link") or job.get("url") or ""
+
+
+def _tokens(job):
+    text = f"{job.get('title') or ''} {job.get('description') or ''}"
+    return _TOKEN_RE.findall(text.lower())
+
+
+# --------------------------- #
+# ✅ Near-duplicate index
+# --------------------------- #
+class JobDeduplicator:
+    """
+    Finds jobs already seen under another ID: same normalized URL, or a
+    MinHash estimate of title + description word-shingle Jaccard similarity
+    of at least `threshold` at the same location.
+
+    Signatures are split into `bands` for locality-sensitive hashing, so a
+    lookup only compares against jobs sharing a band bucket instead of every
+    stored job; 100k jobs cost about 256 bytes of signature each.
+    Jobs are identified by a caller-supplied key (e.g. the Chroma ID), and a
+    job matching only its own key is an update, not a duplicate.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=64, bands=16, shingle_size=3, min_tokens=20, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.min_tokens = min_tokens
+        self._params = dict(threshold=threshold, num_perm=num_perm, bands=bands, shingle_size=shingle_size,
+                            min_tokens=min_tokens, seed=seed)
+        rng = np.random.RandomState(seed)
+        # Shingle hashes are masked to 32 bits, so a * x + b stays below 2**64 and uint64 never wraps
+        self._a = rng.randint(1, 2**32 - 1, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 2**32 - 1, size=num_perm, dtype=np.uint64)
+
+        self._token_hashes = {}
+        self._keys = set()
+        self._urls = {}        # normalized URL -> key
+        self._signatures = {}  # key -> (signature, location)
+        self._buckets = {}     # (band, band bytes) -> set of keys
+        self.url_duplicates = 0
+        self.near_duplicates = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def signature(self, job):
+        """MinHash signature of the job's title + description, or None when too short to judge."""
+        return self.signatures([job])[0]
+
+    def _shingle_hashes(self, tokens):
+        # Word n-gram hashes built from per-token CRCs, so no shingle strings are created
+        hashes = self._token_hashes
+        if len(hashes) > 500_000:
+            hashes.clear()
+        t = np.fromiter(
+            (hashes[tok] if tok in hashes else hashes.setdefault(tok, zlib.crc32(tok.encode("utf-8")))
+             for tok in tokens),
+            dtype=np.uint64, count=len(tokens),
+        )
+        n = self.shingle_size
+        acc = t[: len(t) - n + 1].copy()
+        for i in range(1, n):
+            acc = (acc * np.uint64(1000003) + t[i: len(t) - n + 1 + i]) % _PRIME
+        return acc & _MASK  # below _PRIME is not enough: values up to 2**32 + 14 would overflow a * x
+
+    def signatures(self, jobs):
+        """Signatures for many jobs at once (one vectorised pass); None where too short."""
+        parts, owners = [], []
+        for i, job in enumerate(jobs):
+            tokens = _tokens(job)
+            if len(tokens) >= self.min_tokens:
+                parts.append(self._shingle_hashes(tokens))
+                owners.append(i)
+        result = [None] * len(jobs)
+        if not parts:
+            return result
+        offsets = np.cumsum([0] + [len(p) for p in parts[:-1]])
+        permuted = (np.outer(np.concatenate(parts), self._a) + self._b) % _PRIME & _MASK
+        for i, signature in zip(owners, np.minimum.reduceat(permuted, offsets, axis=0).astype(np.uint32)):
+            result[i] = signature
+        return result
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def find_duplicate(self, job, key=None):
+        """Key of an already indexed duplicate of `job`, or None."""
+        return self._find(job, key, self.signature(job))[0]
+
+    def _find(self, job, key, signature):
+        # (duplicate key, "url" | "near") or (None, None)
+        url = normalize_url(_job_url(job))
+        if url and self._urls.get(url, key) != key:
+            return self._urls[url], "url"
+
+        if signature is None:
+            return None, None
+        location = (job.get("location") or "").strip().lower()
+        checked = set()
+        for band_key in self._band_keys(signature):
+            for candidate in self._buckets.get(band_key, ()):
+                if candidate == key or candidate in checked:
+                    continue
+                checked.add(candidate)
+                other, other_location = self._signatures[candidate]
+                if location and other_location and location != other_location:
+                    continue
+                if np.count_nonzero(signature == other) / len(signature) >= self.threshold:
+                    return candidate, "near"
+        return None, None
+
+    def add(self, job, key, signature=None):
+        """Index `job` under `key` (re-adding a key replaces its entry); `signature` if already computed."""
+        self._keys.add(key)
+        url = normalize_url(_job_url(job))
+        if url:
+            self._urls[url] = key
+        signature = self.signature(job) if signature is None else signature
+        if signature is None:
+            return
+        previous = self._signatures.get(key)
+        if previous is not None:
+            for band_key in self._band_keys(previous[0]):
+                self._buckets.get(band_key, set()).discard(key)
+        self._signatures[key] = (signature, (job.get("location") or "").strip().lower())
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, set()).add(key)
+
+    def is_duplicate(self, job, key):
+        """Check `job` and index it when it is new; True when it duplicates another key."""
+        return self._is_duplicate(job, key, self.signature(job))
+
+    def _is_duplicate(self, job, key, signature):
+        duplicate_of, kind = self._find(job, key, signature)
+        if duplicate_of is None:
+            self.add(job, key, signature)
+            return False
+        if kind == "url":
+            self.url_duplicates += 1
+        else:
+            self.near_duplicates += 1
+        return True
+
+    def filter(self, jobs, key, batch_size=256):
+        """Yield only the jobs that are not duplicates; `key(job)` gives each job's ID."""
+        batch = []
+        for job in jobs:
+            batch.append(job)
+            if len(batch) >= batch_size:
+                yield from self._filter_batch(batch, key)
+                batch = []
+        if batch:
+            yield from self._filter_batch(batch, key)
+
+    def check(self, jobs, key, batch_size=256):
+        """
+        Like filter(), but indexes nothing: returns (job, key, signature) for
+        each job that duplicates neither the index nor an earlier job of
+        `jobs`. Pass them to add() once they are actually stored.
+        """
+        pending = JobDeduplicator(**self._params)  # same hash functions, only this call's jobs
+        new = []
+        for start in range(0, len(jobs), batch_size):
+            batch = jobs[start:start + batch_size]
+            for job, signature in zip(batch, self.signatures(batch)):
+                job_key = key(job)
+                kind = self._find(job, job_key, signature)[1] or pending._find(job, job_key, signature)[1]
+                if kind is None:
+                    pending.add(job, job_key, signature)
+                    new.append((job, job_key, signature))
+                elif kind == "url":
+                    self.url_duplicates += 1
+                else:
+                    self.near_duplicates += 1
+        return new
+
+    def _filter_batch(self, batch, key):
+        for job, signature in zip(batch, self.signatures(batch)):
+            if not self._is_duplicate(job, key(job), signature):
+                yield job
+
+    def stats(self):
+        return {
+            "indexed": len(self),
+            "url_duplicates": self.url_duplicates,
+            "near_duplicates": self.near_duplicates,
+        }
@@ -0,0 +1,258 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from functools import cached_property
+
+import numpy as np
+from chromadb.api.types import EmbeddingFunction
+from chromadb.utils import embedding_functions
+from chromadb.utils.embedding_functions.onnx_mini_lm_l6_v2 import ONNXMiniLM_L6_V2
+
+DEFAULT_EMBEDDING_CACHE_PATH = "./embedding_cache.sqlite3"
+FLOAT_MODEL_ID = "all-MiniLM-L6-v2"
+
+
+def normalize_document(text):
+    """Whitespace-collapsed text, so re-crawled copies of a description hash the same."""
+    return " ".join((text or "").split())
+
+
+# --------------------------- #
+# ✅ Embedding backends
+# --------------------------- #
+class FastMiniLM(ONNXMiniLM_L6_V2):
+    """
+    all-MiniLM-L6-v2 on onnxruntime (CPU), producing the same vectors as
+    Chroma's default embedding function, only faster:
+    - one InferenceSession for the life of the object (Chroma's default
+      builds a new one on every call);
+    - documents are sorted by length and each batch is padded to its longest
+      document instead of always to 256 tokens.
+    Reports itself as "default" so existing collections accept it.
+    """
+
+    model_id = FLOAT_MODEL_ID
+
+    def __init__(self, batch_size=64, threads=None):
+        super().__init__(preferred_providers=["CPUExecutionProvider"])
+        self.batch_size = batch_size
+        self.threads = threads
+
+    @staticmethod
+    def name():
+        return "default"
+
+    def get_config(self):
+        return {}
+
+    @cached_property
+    def tokenizer(self):
+        tokenizer = self.Tokenizer.from_file(
+            os.path.join(self.DOWNLOAD_PATH, self.EXTRACTED_FOLDER_NAME, "tokenizer.json")
+        )
+        tokenizer.enable_truncation(max_length=256)
+        tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")  # to the longest document in the batch
+        return tokenizer
+
+    def _model_path(self):
+        return os.path.join(self.DOWNLOAD_PATH, self.EXTRACTED_FOLDER_NAME, "model.onnx")
+
+    @cached_property
+    def model(self):
+        options = self.ort.SessionOptions()
+        options.log_severity_level = 3
+        options.graph_optimization_level = self.ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.threads:
+            options.intra_op_num_threads = self.threads
+        return self.ort.InferenceSession(
+            self._model_path(), providers=["CPUExecutionProvider"], sess_options=options
+        )
+
+    def _forward(self, documents, batch_size=None):
+        batch_size = batch_size or self.batch_size
+        embeddings = np.empty((len(documents), 384), dtype=np.float32)
+        order = sorted(range(len(documents)), key=lambda i: len(documents[i]))
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            encoded = self.tokenizer.encode_batch([documents[i] for i in batch])
+            input_ids = np.array([e.ids for e in encoded], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in encoded], dtype=np.int64)
+            hidden = self.model.run(None, {
+                "input_ids": input_ids,
+                "attention_mask": attention_mask,
+                "token_type_ids": np.zeros_like(input_ids),
+            })[0]
+            # Mean pooling over real tokens, as sentence-transformers does
+            mask = attention_mask[..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            embeddings[batch] = self._normalize(pooled)
+        return embeddings
+
+
+class QuantizedMiniLM(FastMiniLM):
+    """
+    FastMiniLM on an int8 dynamically quantized copy of the model, built once
+    next to the original (needs the `onnx` package). Its vectors are close
+    to, not identical with, the float model's, so it has its own name and
+    model id: collections and cache entries never mix the two.
+    """
+
+    model_id = FLOAT_MODEL_ID + "-int8"
+
+    @staticmethod
+    def name():
+        return "all-minilm-l6-v2-int8"
+
+    @staticmethod
+    def build_from_config(config):
+        return QuantizedMiniLM()
+
+    def _model_path(self):
+        path = super()._model_path()
+        quantized_path = path.replace("model.onnx", "model.int8.onnx")
+        if not os.path.exists(quantized_path):
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            partial = quantized_path.replace(".onnx", ".partial.onnx")
+            quantize_dynamic(path, partial, weight_type=QuantType.QInt8)
+            os.replace(partial, quantized_path)
+        return quantized_path
+
+
+BACKENDS = {
+    "default": lambda: embedding_functions.DefaultEmbeddingFunction(),
+    "onnx": lambda: FastMiniLM(),
+    "onnx-int8": lambda: QuantizedMiniLM(),
+}
+
+
+def embedding_model_id(fn):
+    """
+    Id of the model behind an embedding function, stored with each
+    collection so vectors from different models are never mixed.
+    Functions without a `model_id` are identified by their Chroma name
+    ("default" being the float MiniLM).
+    """
+    model_id = getattr(fn, "model_id", None)
+    if model_id:
+        return model_id
+    name = fn.name()
+    return FLOAT_MODEL_ID if name == "default" else name
+
+
+# --------------------------- #
+# ✅ Persistent embedding store
+# --------------------------- #
+class EmbeddingStore:
+    """
+    SQLite map from (model, normalized document text) hash to its float32
+    vector. Shared by every collection, so reindexing, recrawls and moving
+    jobs between collections never embed the same text twice.
+    """
+
+    def __init__(self, path=DEFAULT_EMBEDDING_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)")
+
+    @staticmethod
+    def key(model_id, text):
+        return hashlib.sha256(f"{model_id}\x1f{normalize_document(text)}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys):
+        """{key: vector} for the keys that are stored."""
+        found = {}
+        keys = list(keys)
+        with self._lock:
+            for i in range(0, len(keys), 500):  # stay under SQLite's bound-parameter limit
+                chunk = keys[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update((key, np.frombuffer(blob, dtype=np.float32)) for key, blob in rows)
+        return found
+
+    def put_many(self, items):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?)",
+                ((key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items),
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddingFunction(EmbeddingFunction):
+    """
+    Wraps an embedding function with an EmbeddingStore: only documents whose
+    normalized text was never embedded by `model_id` reach the model, each
+    distinct text once per call. Keeps the wrapped function's Chroma name and
+    config, so collections see no difference. Queries (embed_query) are read
+    from the store but never added to it, so it only grows with documents.
+    """
+
+    def __init__(self, inner, store=None, model_id=None):
+        self.inner = inner
+        self.store = store if store is not None else EmbeddingStore()
+        self.model_id = model_id or inner.name()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, input):
+        keys = [EmbeddingStore.key(self.model_id, text) for text in input]
+        found = self.store.get_many(set(keys))
+        missing = {key: text for key, text in zip(keys, input) if key not in found}
+        if missing:
+            vectors = self.inner(list(missing.values()))
+            new = list(zip(missing, (np.asarray(v, dtype=np.float32) for v in vectors)))
+            self.store.put_many(new)
+            found.update(new)
+        self.misses += len(missing)
+        self.hits += len(keys) - len(missing)
+        return [found[key] for key in keys]
+
+    def embed_query(self, input):
+        keys = [EmbeddingStore.key(self.model_id, text) for text in input]
+        found = self.store.get_many(set(keys))
+        missing = [text for key, text in zip(keys, input) if key not in found]
+        vectors = iter(self.inner(missing) if missing else ())
+        return [found[key] if key in found else np.asarray(next(vectors), dtype=np.float32) for key in keys]
+
+    def name(self):
+        return self.inner.name()
+
+    def get_config(self):
+        return self.inner.get_config()
+
+    @staticmethod
+    def build_from_config(config):
+        return embedding_functions.DefaultEmbeddingFunction.build_from_config(config)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+def make_embedding_function(backend=None, cache_path=DEFAULT_EMBEDDING_CACHE_PATH):
+    """
+    Embedding function for db_manager. `backend` is one of BACKENDS
+    (default: $JOB_SCRAPER_EMBEDDING or "onnx"); with a `cache_path`
+    the function is wrapped in a CachedEmbeddingFunction stored there.
+    """
+    backend = backend or os.environ.get("JOB_SCRAPER_EMBEDDING", "onnx")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend {backend!r}; choose from {', '.join(BACKENDS)}")
+    inner = BACKENDS[backend]()
+    if not cache_path:
+        return inner
+    # The float backends share cache entries; the int8 model keys its own
+    return CachedEmbeddingFunction(inner, EmbeddingStore(cache_path), embedding_model_id(inner))
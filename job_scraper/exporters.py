@@ -0,0 +1,230 @@
+import importlib.util
+import itertools
+import json
+import os
+import threading
+import time
+
+# Optional columnar output; NDJSON and Excel work without it. Only looked up
+# here: pyarrow itself is imported by the first ParquetExporter.
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+EXPORT_ROOT = "crawled_output"
+_part_numbers = itertools.count(1)
+
+# Fixed column set so files from every crawler (and every run) share one schema
+COLUMNS = [
+    "company", "job_id", "title", "location", "date_posted", "apply_url",
+    "description", "matched_skills", "crawled_at", "extra",
+]
+_KNOWN_FIELDS = set(COLUMNS) | {"application_link"}
+
+
+def to_record(job, company=None, crawled_at=None):
+    """Flatten a crawled job into the export columns; unknown fields go to `extra` as JSON."""
+    extra = {k: v for k, v in job.items() if k not in _KNOWN_FIELDS}
+    return {
+        "company": job.get("company") or company or "",
+        "job_id": str(job.get("job_id") or ""),
+        "title": job.get("title") or "",
+        "location": job.get("location") or "",
+        "date_posted": str(job.get("date_posted") or ""),
+        "apply_url": job.get("apply_url") or job.get("application_link") or "",
+        "description": job.get("description") or "",
+        "matched_skills": [str(s) for s in job.get("matched_skills") or []],
+        "crawled_at": int(crawled_at if crawled_at is not None else time.time()),
+        "extra": json.dumps(extra, default=str) if extra else "",
+    }
+
+
+# --------------------------- #
+# ✅ Exporters
+# --------------------------- #
+class Exporter:
+    """
+    Writes jobs to one file as they arrive: call `write(job)` per job (or
+    `write_many(jobs)`) and `close()` at the end, or use it as a context
+    manager. Thread-safe, so a crawl can stream into it from workers.
+    """
+
+    extension = ""
+
+    def __init__(self, path, company=None):
+        self.path = path
+        self.company = company
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def write(self, job):
+        record = to_record(job, self.company)
+        with self._lock:
+            self._write(record)
+            self.count += 1
+
+    def write_many(self, jobs):
+        for job in jobs:
+            self.write(job)
+        return self.count
+
+    def _write(self, record):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class NDJSONExporter(Exporter):
+    """One JSON object per line, appended; each line is flushed as it is written."""
+
+    extension = "ndjson"
+
+    def __init__(self, path, company=None):
+        super().__init__(path, company)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class ParquetExporter(Exporter):
+    """
+    Parquet written in row groups of `row_group_size` jobs, so memory stays
+    bounded however long the crawl. Parquet files can't be appended to, so
+    every run writes its own part file (see export_path).
+    """
+
+    extension = "parquet"
+
+    def __init__(self, path, company=None, row_group_size=500):
+        if not HAS_PYARROW:
+            raise ImportError("Parquet export needs pyarrow (pip install pyarrow)")
+        super().__init__(path, company)
+        self.row_group_size = row_group_size
+        self._rows = []
+        self._writer = None
+
+    @staticmethod
+    def schema():
+        import pyarrow as pa
+        return pa.schema([
+            (name, pa.list_(pa.string()) if name == "matched_skills"
+             else pa.int64() if name == "crawled_at" else pa.string())
+            for name in COLUMNS
+        ])
+
+    def _flush(self):
+        if not self._rows:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.Table.from_pylist(self._rows, schema=self.schema())
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema, compression="zstd")
+        self._writer.write_table(table)
+        self._rows = []
+
+    def _write(self, record):
+        self._rows.append(record)
+        if len(self._rows) >= self.row_group_size:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+class ExcelExporter(Exporter):
+    """Final .xlsx export; rows are collected and the file is overwritten on close()."""
+
+    extension = "xlsx"
+
+    def __init__(self, path, company=None):
+        super().__init__(path, company)
+        self._rows = []
+
+    def _write(self, record):
+        record = dict(record, matched_skills=", ".join(record["matched_skills"]))
+        self._rows.append(record)
+
+    def close(self):
+        with self._lock:
+            if self._rows:
+                import pandas as pd  # only the Excel path needs pandas/openpyxl
+                pd.DataFrame(self._rows, columns=COLUMNS).to_excel(self.path, index=False)
+                self._rows = []
+
+
+class MultiExporter(Exporter):
+    """Fans every job out to several exporters."""
+
+    def __init__(self, exporters):
+        super().__init__(None)
+        self.exporters = list(exporters)
+
+    @property
+    def paths(self):
+        return [e.path for e in self.exporters]
+
+    def write(self, job):
+        for exporter in self.exporters:
+            exporter.write(job)
+        self.count += 1
+
+    def close(self):
+        for exporter in self.exporters:
+            exporter.close()
+
+
+EXPORTERS = {"ndjson": NDJSONExporter, "parquet": ParquetExporter, "excel": ExcelExporter}
+
+
+def available_formats():
+    return [fmt for fmt in EXPORTERS if fmt != "parquet" or HAS_PYARROW]
+
+
+def export_path(fmt, company, root=EXPORT_ROOT, partition_by_date=True):
+    """
+    Where a run's export goes:
+      ndjson  → <root>/ndjson/<company>/date=YYYY-MM-DD/jobs.ndjson (appended all day)
+      parquet → <root>/parquet/<company>/date=YYYY-MM-DD/part-HHMMSS-<pid>-<n>.parquet
+      excel   → <root>/<company>_jobs.xlsx (overwritten)
+    Formats live in separate trees so each directory reads as one dataset.
+    Without `partition_by_date` the date=... directory is left out.
+    """
+    if fmt == "excel":
+        return os.path.join(root, f"{company}_jobs.xlsx")
+    folder = os.path.join(root, fmt, company)
+    if partition_by_date:
+        folder = os.path.join(folder, f"date={time.strftime('%Y-%m-%d')}")
+    if fmt == "ndjson":
+        return os.path.join(folder, "jobs.ndjson")
+    return os.path.join(folder, f"part-{time.strftime('%H%M%S')}-{os.getpid()}-{next(_part_numbers)}.parquet")
+
+
+def open_exporter(fmt, company, root=EXPORT_ROOT, partition_by_date=True, **kwargs):
+    """Exporter for `fmt` ("ndjson", "parquet" or "excel") at its export_path()."""
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Unknown export format {fmt!r}; choose from {', '.join(EXPORTERS)}")
+    path = export_path(fmt, company, root, partition_by_date)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return EXPORTERS[fmt](path, company, **kwargs)
+
+
+def open_exporters(formats, company, root=EXPORT_ROOT, partition_by_date=True):
+    """One MultiExporter writing the same jobs in every format in `formats`."""
+    return MultiExporter(open_exporter(fmt, company, root, partition_by_date) for fmt in formats)
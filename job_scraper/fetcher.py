@@ -0,0 +1,275 @@
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .http_cache import active_cache
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; JobScraper/1.0)"}
+
+
+# --------------------------- #
+# ✅ Shared HTTP session
+# --------------------------- #
+def make_session(pool_size=10, headers=None):
+    """
+    Build a requests.Session with a keep-alive connection pool sized for
+    `pool_size` requests in flight against the same host.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(headers or DEFAULT_HEADERS)
+    return session
+
+
+# --------------------------- #
+# ✅ Retries and backoff
+# --------------------------- #
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+def backoff_delay(attempt, base=0.5, cap=30.0):
+    """Exponential backoff with full jitter: a random wait in [0, base * 2**attempt], capped."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def retry_after_seconds(headers, cap=120.0):
+    """Seconds asked for by a Retry-After header (delta-seconds or HTTP date), or None."""
+    headers = headers or {}
+    value = headers.get("Retry-After") or headers.get("retry-after")  # Playwright lower-cases names
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), cap)
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request to a host whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker: after `failure_threshold` consecutive failures
+    a host is skipped for `reset_timeout` seconds, then one trial request is
+    let through (half-open) and its outcome closes or re-opens the circuit.
+    Non-blocking, so it works from threads and from asyncio alike.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = {}
+        self._opened_at = {}
+        self._trial_running = set()
+
+    def allow(self, url):
+        host = _host(url)
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return True
+            if time.monotonic() - opened_at < self.reset_timeout or host in self._trial_running:
+                return False
+            self._trial_running.add(host)
+            return True
+
+    def record_success(self, url):
+        host = _host(url)
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+            self._trial_running.discard(host)
+
+    def record_failure(self, url):
+        host = _host(url)
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if host in self._trial_running or self._failures[host] >= self.failure_threshold:
+                if host not in self._opened_at:
+                    print(f"🔌 Circuit open for {host} after {self._failures[host]} failures", file=sys.stderr)
+                self._opened_at[host] = time.monotonic()
+            self._trial_running.discard(host)
+
+    def is_open(self, url):
+        return _host(url) in self._opened_at
+
+
+def _host(url):
+    return urlparse(url).netloc.lower()
+
+
+# --------------------------- #
+# ✅ Per-host politeness limits
+# --------------------------- #
+class HostLimiter:
+    """
+    Caps concurrent requests per host and spaces request starts so that a
+    host sees at most `rate_per_host` requests per second (None = unlimited).
+    Thread-safe; share one instance across all workers of a crawl.
+
+    With `adaptive=True` the rate follows the host: it is halved on 429/503
+    responses, connection errors or latency climbing to 3x the best seen, and
+    creeps back up on successes, never above `rate_per_host` (an unlimited
+    host gets a rate the first time it pushes back). A CircuitBreaker stops
+    requests to hosts that keep failing.
+    """
+
+    def __init__(self, max_per_host=4, rate_per_host=None, adaptive=True, min_rate=0.2, breaker=None):
+        self.max_per_host = max_per_host
+        self.rate_per_host = rate_per_host
+        self.adaptive = adaptive
+        self.min_rate = min_rate
+        self.breaker = breaker or CircuitBreaker()
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_start = {}
+        self._rates = {}    # host -> current adaptive rate (None = unlimited)
+        self._latency = {}  # host -> (EWMA seconds, best EWMA seen)
+
+    def _semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._semaphores[host]
+
+    def rate(self, url):
+        """Current request rate allowed for the host of `url` (None = unlimited)."""
+        return self._rates.get(_host(url), self.rate_per_host)
+
+    def _wait_for_turn(self, host):
+        with self._lock:
+            rate = self._rates.get(host, self.rate_per_host)
+            now = time.monotonic()
+            start_at = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start_at + (1.0 / rate if rate else 0.0)
+        if start_at > now:
+            time.sleep(start_at - now)
+
+    def pause(self, url, seconds):
+        """Hold back every request to the host of `url` for `seconds` (e.g. Retry-After)."""
+        host = _host(url)
+        with self._lock:
+            self._next_start[host] = max(self._next_start.get(host, 0.0), time.monotonic() + seconds)
+
+    def record(self, url, latency=None, throttled=False, failed=False):
+        """Feed one request's outcome back into the host's rate and circuit breaker."""
+        host = _host(url)
+        if failed or throttled:
+            self.breaker.record_failure(url)
+        else:
+            self.breaker.record_success(url)
+        if not self.adaptive:
+            return
+
+        with self._lock:
+            slow = False
+            if latency is not None:
+                ewma, best = self._latency.get(host, (latency, latency))
+                ewma = 0.8 * ewma + 0.2 * latency
+                self._latency[host] = (ewma, min(best, ewma))
+                slow = ewma > 3 * min(best, ewma) and ewma > 0.5
+
+            rate = self._rates.get(host, self.rate_per_host)
+            if throttled or failed or slow:
+                if rate is None:
+                    # First push-back from an unlimited host: start from the rate it was handling
+                    ewma = self._latency.get(host, (1.0, 1.0))[0]
+                    rate = self.max_per_host / max(ewma, 0.05)
+                rate = max(self.min_rate, rate / 2)
+            elif rate is not None:
+                # Additive recovery: 5% of the configured ceiling per successful request
+                rate += 0.05 * (self.rate_per_host or rate)
+                if self.rate_per_host is not None:
+                    rate = min(rate, self.rate_per_host)
+            self._rates[host] = rate
+
+    @contextmanager
+    def slot(self, url):
+        if not self.breaker.allow(url):
+            raise CircuitOpenError(f"Circuit open for {_host(url)}; skipping {url}")
+        host = _host(url)
+        semaphore = self._semaphore(host)
+        with semaphore:
+            self._wait_for_turn(host)
+            yield
+
+
+def fetch(session, url, limiter=None, retries=3, backoff=0.5, retry_statuses=RETRY_STATUSES, cache=None,
+          method="GET", **kwargs):
+    """
+    GET (or `method`) `url` through `session`, holding a per-host slot when a
+    limiter is given. When a response cache is enabled (see http_cache.enable)
+    fresh cached 200s for GETs are returned without touching the network;
+    `cache=False` bypasses it.
+    Connection errors, timeouts and `retry_statuses` are retried up to `retries`
+    times with jittered exponential backoff, or after Retry-After when the
+    server sends one; the wait happens outside the host slot. The last
+    response is returned even if its status is still retryable, so callers
+    keep checking status_code. Raises CircuitOpenError for a tripped host.
+    """
+    if method != "GET":
+        cache = False
+    elif cache is None:
+        cache = active_cache()
+    if cache:
+        cached = cache.get(url, kwargs.get("params"))
+        if cached is not None:
+            return cached
+
+    for attempt in range(retries + 1):
+        started = time.monotonic()
+        try:
+            if limiter is None:
+                response = session.request(method, url, **kwargs)
+            else:
+                with limiter.slot(url):
+                    started = time.monotonic()
+                    response = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if limiter is not None:
+                limiter.record(url, failed=True)
+            if attempt == retries:
+                raise
+            delay = backoff_delay(attempt, backoff)
+            print(f"🔁 {type(e).__name__} for {url}; retry {attempt + 1}/{retries} in {delay:.1f}s", file=sys.stderr)
+            time.sleep(delay)
+            continue
+
+        latency = time.monotonic() - started
+        retryable = response.status_code in retry_statuses
+        if limiter is not None:
+            limiter.record(
+                url, latency,
+                throttled=response.status_code in THROTTLE_STATUSES,
+                failed=retryable and response.status_code not in THROTTLE_STATUSES,
+            )
+        if not retryable or attempt == retries:
+            if cache:
+                cache.put(url, response, kwargs.get("params"))
+            return response
+
+        delay = retry_after_seconds(response.headers)
+        if delay is None:
+            delay = backoff_delay(attempt, backoff)
+        elif limiter is not None:
+            limiter.pause(url, delay)
+        print(f"🔁 HTTP {response.status_code} for {url}; retry {attempt + 1}/{retries} in {delay:.1f}s", file=sys.stderr)
+        response.close()
+        time.sleep(delay)
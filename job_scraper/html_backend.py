@@ -0,0 +1,93 @@
+import os
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Optional fast parsers: lxml backs BeautifulSoup, selectolax skips it entirely
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    try:
+        # selectolax < 0.3.13 only ships the Modest engine
+        from selectolax.parser import HTMLParser
+        HAS_SELECTOLAX = True
+    except ImportError:
+        HAS_SELECTOLAX = False
+
+
+def default_backend():
+    """Fastest available backend, overridable with JOB_SCRAPER_PARSER."""
+    forced = os.environ.get("JOB_SCRAPER_PARSER")
+    if forced:
+        return forced
+    if HAS_SELECTOLAX:
+        return "selectolax"
+    return "lxml" if HAS_LXML else "html.parser"
+
+
+BACKEND = default_backend()
+
+
+def _soup_parser(backend):
+    # selectolax has no BeautifulSoup tree builder; lxml is the next best for soups
+    backend = backend or BACKEND
+    if backend == "selectolax":
+        return "lxml" if HAS_LXML else "html.parser"
+    return backend
+
+
+# --------------------------- #
+# ✅ Full trees
+# --------------------------- #
+def make_soup(markup, parse_only=None, backend=None):
+    """
+    BeautifulSoup on the fastest available tree builder.
+    `parse_only` (a SoupStrainer) keeps only the matching elements, which is
+    much cheaper when a page only needs its listing cards or its links.
+    """
+    return BeautifulSoup(markup, _soup_parser(backend), parse_only=parse_only)
+
+
+def only(*names, **attrs):
+    """Shorthand for a SoupStrainer, e.g. only("a") or only(class_="list-item--card")."""
+    if isinstance(attrs.get("class_"), str):
+        # While parsing, `class` is still one unsplit string, so match a single class by hand
+        wanted = attrs["class_"]
+        attrs["class_"] = lambda value: bool(value) and wanted in (
+            value.split() if isinstance(value, str) else value
+        )
+    return SoupStrainer(*names, **attrs)
+
+
+# --------------------------- #
+# ✅ Targeted extraction
+# --------------------------- #
+def html_to_text(markup, backend=None):
+    """Visible text of an HTML fragment, whitespace-collapsed."""
+    if not markup:
+        return ""
+    backend = backend or BACKEND
+    if backend == "selectolax" and HAS_SELECTOLAX:
+        text = HTMLParser(markup).text(separator=" ")
+    else:
+        text = make_soup(markup, backend=backend).get_text(separator=" ", strip=True)
+    return " ".join(text.split())
+
+
+def select_first_text(markup, selector, backend=None):
+    """
+    Text of the first element matching a CSS `selector`, or None.
+    With selectolax no BeautifulSoup tree is built at all.
+    """
+    backend = backend or BACKEND
+    if backend == "selectolax" and HAS_SELECTOLAX:
+        node = HTMLParser(markup).css_first(selector)
+        return " ".join(node.text(separator=" ").split()) if node is not None else None
+
+    node = make_soup(markup, backend=backend).select_one(selector)
+    return " ".join(node.get_text(separator=" ", strip=True).split()) if node is not None else None
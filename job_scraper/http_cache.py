@@ -0,0 +1,225 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_CACHE_PATH = "./http_cache.sqlite3"
+_TRANSFER_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class OfflineCacheMiss(requests.RequestException):
+    """Raised in offline mode for a request that is not in the cache."""
+
+
+def cache_key(url, params=None):
+    """Key for a GET of `url` with optional query `params` (order-insensitive)."""
+    query = urlencode(sorted((params or {}).items()), doseq=True)
+    return hashlib.sha1(f"GET {url}?{query}".encode("utf-8")).hexdigest()
+
+
+# --------------------------- #
+# ✅ On-disk response cache
+# --------------------------- #
+class ResponseCache:
+    """
+    SQLite store of successful (200) GET responses with zlib-compressed
+    bodies, for development and repeat crawls.
+
+    Entries older than `ttl` seconds (None = never) are treated as misses.
+    Once the stored bodies exceed `max_bytes` the least recently used
+    entries are evicted. With `offline=True` any stored entry is served
+    regardless of age and a miss raises OfflineCacheMiss instead of going
+    to the network. Safe to share between threads and processes.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=24 * 3600, max_bytes=256 * 1024 * 1024, offline=False):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    url TEXT,
+                    status INTEGER,
+                    headers TEXT,
+                    body BLOB,
+                    size INTEGER,
+                    stored_at REAL,
+                    last_used REAL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+            self._evict()  # the budget may have shrunk since the cache was written
+
+    def get(self, url, params=None):
+        """Cached requests.Response for this GET, or None on a miss (OfflineCacheMiss when offline)."""
+        key = cache_key(url, params)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status, headers, body, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            fresh = row is not None and (self.offline or self.ttl is None or time.time() - row[4] <= self.ttl)
+            if fresh:
+                self.hits += 1
+                with self._conn:
+                    self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            else:
+                self.misses += 1
+        if not fresh:
+            if self.offline:
+                raise OfflineCacheMiss(f"Offline and not cached: {url}")
+            return None
+
+        response = requests.Response()
+        response.status_code = row[1]
+        response.headers = CaseInsensitiveDict(json.loads(row[2]))
+        response._content = zlib.decompress(row[3])
+        response.url = row[0]
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
+        response.from_cache = True
+        return response
+
+    def put(self, url, response, params=None):
+        """Store a 200 response; anything else is ignored."""
+        if response.status_code != 200:
+            return
+        body = zlib.compress(response.content, 6)
+        # The body is stored decoded, so transfer headers no longer describe it
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _TRANSFER_HEADERS}
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (cache_key(url, params), response.url or url, response.status_code,
+                 json.dumps(headers), body, len(body), now, now),
+            )
+            self.stores += 1
+            self._evict()
+
+    def _evict(self):
+        # Called with the lock held, inside a transaction
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+            if total <= self.max_bytes * 0.9:  # evict a little extra so this doesn't run on every put
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# --------------------------- #
+# ✅ Process-wide cache used by fetcher.fetch()
+# --------------------------- #
+_active = None
+_active_lock = threading.Lock()
+
+
+def enable(path=DEFAULT_CACHE_PATH, ttl=24 * 3600, max_bytes=256 * 1024 * 1024, offline=False):
+    """
+    Route every fetcher.fetch() GET in this process through a ResponseCache.
+    The settings are also exported to the environment, so Playwright worker
+    processes started afterwards use the same cache. Resident workers that
+    are already running get them with each crawl request (see settings()).
+    """
+    global _active
+    with _active_lock:
+        if _active is not None:
+            _active.close()
+        _active = ResponseCache(path, ttl, max_bytes, offline)
+    os.environ["JOB_SCRAPER_HTTP_CACHE"] = path
+    os.environ["JOB_SCRAPER_HTTP_CACHE_TTL"] = "" if ttl is None else str(ttl)
+    os.environ["JOB_SCRAPER_HTTP_CACHE_MAX_BYTES"] = str(max_bytes)
+    os.environ["JOB_SCRAPER_OFFLINE"] = "1" if offline else ""
+    return _active
+
+
+def disable():
+    global _active
+    with _active_lock:
+        if _active is not None:
+            _active.close()
+        _active = None
+    for name in ("JOB_SCRAPER_HTTP_CACHE", "JOB_SCRAPER_HTTP_CACHE_TTL", "JOB_SCRAPER_HTTP_CACHE_MAX_BYTES",
+                 "JOB_SCRAPER_OFFLINE"):
+        os.environ.pop(name, None)
+
+
+def settings():
+    """
+    The enabled cache's settings as a JSON-able dict, or None when disabled.
+    Sent with every Playwright crawl request, since a resident worker
+    outlives the environment it was started with.
+    """
+    cache = active_cache()
+    if cache is None:
+        return None
+    return {"path": cache.path, "ttl": cache.ttl, "max_bytes": cache.max_bytes, "offline": cache.offline}
+
+
+def configure(cache_settings):
+    """Enable the cache with `cache_settings` (from settings()), or disable it for None; no-op when unchanged."""
+    if cache_settings == settings():
+        return
+    if cache_settings is None:
+        disable()
+    else:
+        enable(**cache_settings)
+
+
+def active_cache():
+    """The enabled cache, or None. JOB_SCRAPER_HTTP_CACHE=<path> enables it (with JOB_SCRAPER_OFFLINE=1 offline)."""
+    global _active
+    if _active is None and os.environ.get("JOB_SCRAPER_HTTP_CACHE"):
+        with _active_lock:
+            if _active is None:
+                ttl = os.environ.get("JOB_SCRAPER_HTTP_CACHE_TTL", str(24 * 3600))
+                max_bytes = os.environ.get("JOB_SCRAPER_HTTP_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+                _active = ResponseCache(
+                    os.environ["JOB_SCRAPER_HTTP_CACHE"],
+                    ttl=float(ttl) if ttl else None,
+                    max_bytes=int(max_bytes),
+                    offline=bool(os.environ.get("JOB_SCRAPER_OFFLINE")),
+                )
+    return _active
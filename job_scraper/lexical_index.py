@@ -0,0 +1,199 @@
+import re
+import sqlite3
+import threading
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# bm25() column weights: title, job_id, description, location, skills
+COLUMN_WEIGHTS = (4.0, 4.0, 1.0, 1.5, 2.0)
+
+
+def fts_query(text):
+    """
+    FTS5 MATCH expression requiring every word of `text` (each quoted, so
+    user input can't inject FTS syntax), or None if it has no words.
+    """
+    tokens = _TOKEN_RE.findall((text or "").lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"' for token in dict.fromkeys(tokens))
+
+
+class LexicalIndex:
+    """
+    Local BM25 inverted index (SQLite FTS5, Porter-stemmed) over job title,
+    job ID, description, location and skills, kept next to the Chroma
+    collections so exact-term queries ("SAP ABAP", a job ID) never touch the
+    embedding model. Rows are keyed by (collection, Chroma ID), so re-crawls update in
+    place just like the Chroma upserts. Every write bumps a per-collection
+    version that other processes can read (see versions()). Safe to share
+    between threads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    doc INTEGER PRIMARY KEY,
+                    id TEXT,
+                    collection TEXT,
+                    company TEXT,
+                    title TEXT,
+                    job_id TEXT,
+                    description TEXT,
+                    location TEXT,
+                    skills TEXT,
+                    url TEXT,
+                    crawled_at INTEGER,
+                    UNIQUE (collection, id)
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+                    title, job_id, description, location, skills,
+                    content='jobs', content_rowid='doc', tokenize='porter unicode61'
+                );
+                CREATE TABLE IF NOT EXISTS versions (
+                    collection TEXT PRIMARY KEY,
+                    version INTEGER
+                );
+                CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+                    INSERT INTO jobs_fts (rowid, title, job_id, description, location, skills)
+                    VALUES (new.doc, new.title, new.job_id, new.description, new.location, new.skills);
+                END;
+                CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+                    INSERT INTO jobs_fts (jobs_fts, rowid, title, job_id, description, location, skills)
+                    VALUES ('delete', old.doc, old.title, old.job_id, old.description, old.location, old.skills);
+                END;
+                CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE ON jobs BEGIN
+                    INSERT INTO jobs_fts (jobs_fts, rowid, title, job_id, description, location, skills)
+                    VALUES ('delete', old.doc, old.title, old.job_id, old.description, old.location, old.skills);
+                    INSERT INTO jobs_fts (rowid, title, job_id, description, location, skills)
+                    VALUES (new.doc, new.title, new.job_id, new.description, new.location, new.skills);
+                END;
+                """
+            )
+
+    def upsert(self, collection, rows):
+        """Add or replace jobs given as (id, document, metadata) with db_manager's metadata shape."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO jobs (id, collection, company, title, job_id, description, location, skills, url, crawled_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (collection, id) DO UPDATE SET
+                    company = excluded.company, title = excluded.title, job_id = excluded.job_id,
+                    description = excluded.description, location = excluded.location,
+                    skills = excluded.skills, url = excluded.url, crawled_at = excluded.crawled_at
+                """,
+                (
+                    (job_id, collection, meta.get("company", collection), meta.get("title", ""),
+                     meta.get("job_id", ""), document or "", meta.get("location", ""), meta.get("skills", ""),
+                     meta.get("url", ""), meta.get("crawled_at"))
+                    for job_id, document, meta in rows
+                ),
+            )
+            self._bump(collection)
+
+    def _bump(self, collection):
+        # Same transaction as the write, so a reader never sees new rows under an old version
+        self._conn.execute(
+            "INSERT INTO versions VALUES (?, 1) ON CONFLICT (collection) DO UPDATE SET version = version + 1",
+            (collection,),
+        )
+
+    def versions(self, collections):
+        """{collection: write counter}, shared by every process using this index (0 if never written)."""
+        collections = list(collections)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT collection, version FROM versions WHERE collection IN ({','.join('?' * len(collections))})",
+                collections,
+            ).fetchall()
+        found = dict(rows)
+        return {collection: found.get(collection, 0) for collection in collections}
+
+    def count(self, collection):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs WHERE collection = ?", (collection,)).fetchone()[0]
+
+    def clear(self, collection=None):
+        with self._lock, self._conn:
+            if collection is None:
+                self._conn.execute("DELETE FROM jobs")
+                self._conn.execute("UPDATE versions SET version = version + 1")
+            else:
+                self._conn.execute("DELETE FROM jobs WHERE collection = ?", (collection,))
+                self._bump(collection)
+
+    @staticmethod
+    def _filters(collections, locations, since):
+        clauses, params = [f"j.collection IN ({','.join('?' * len(collections))})"], list(collections)
+        if locations:
+            clauses.append(f"j.location IN ({','.join('?' * len(locations))})")
+            params.extend(locations)
+        if since is not None:
+            clauses.append("j.crawled_at >= ?")
+            params.append(int(since))
+        return " AND ".join(clauses), params
+
+    def search(self, query_text, collections, n_results=10, offset=0, locations=None, since=None):
+        """
+        Best BM25 matches for all words of `query_text` within `collections`,
+        as dicts with id, collection, document, metadata fields and `bm25`
+        (lower is better, as SQLite reports it).
+        """
+        match = fts_query(query_text)
+        if not match or not collections:
+            return []
+        where, params = self._filters(collections, locations, since)
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT j.id, j.collection, j.company, j.title, j.location, j.url, j.description,
+                       bm25(jobs_fts, {', '.join(map(str, COLUMN_WEIGHTS))}) AS score
+                FROM jobs_fts JOIN jobs j ON j.doc = jobs_fts.rowid
+                WHERE jobs_fts MATCH ? AND {where}
+                ORDER BY score LIMIT ? OFFSET ?
+                """,
+                [match, *params, n_results, offset],
+            ).fetchall()
+        return [
+            {"id": job_id, "collection": collection, "company": company, "title": title, "location": location,
+             "url": url, "document": document, "bm25": score}
+            for job_id, collection, company, title, location, url, document, score in rows
+        ]
+
+    def count_matches(self, query_text, collections, locations=None, since=None):
+        """Number of jobs containing every word of `query_text` (after stemming)."""
+        match = fts_query(query_text)
+        if not match or not collections:
+            return 0
+        where, params = self._filters(collections, locations, since)
+        with self._lock:
+            return self._conn.execute(
+                f"""
+                SELECT COUNT(*) FROM jobs_fts JOIN jobs j ON j.doc = jobs_fts.rowid
+                WHERE jobs_fts MATCH ? AND {where}
+                """,
+                [match, *params],
+            ).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def reciprocal_rank_fusion(rankings, k=60):
+    """
+    Fuse ranked lists of keys: each key scores sum(1 / (k + rank)) over the
+    lists it appears in (rank from 1). Returns [(key, score)] best first.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
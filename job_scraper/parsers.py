@@ -1,4 +1,5 @@
 from urllib.parse import urljoin, urlparse
+from .dedup import unique_urls
 
 def capgemini_parser(soup, base):
     """
@@ -20,7 +21,7 @@ def capgemini_parser(soup, base):
             if href and "capgemini.com" not in href:
                 links.append(urljoin(base, href))
 
-    return list(set(links))
+    return unique_urls(links)
 
 
 def barclays_parser(soup, base):
@@ -37,7 +38,7 @@ def generic_parser(soup, base):
         href = a["href"].lower()
         if any(k in href for k in ["job", "career", "apply", "vacancy"]):
             links.append(urljoin(base, a["href"]))
-    return list(set(links))
+    return unique_urls(links)
 
 
 def get_job_links(soup, start_url):
@@ -1,167 +1,521 @@
-import sys, os, json, asyncio, traceback, re, requests
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
+import sys, os, json, asyncio, threading, traceback, re, time
+from urllib.parse import urljoin, urlparse
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from job_scraper import http_cache
+from job_scraper.api_capture import ApiCapture, iter_api_jobs
+from job_scraper.html_backend import make_soup, only
 from job_scraper.parsers import get_job_links
 from job_scraper.extractors import extract_job_details
-from job_scraper.utils import text_contains_any
+from job_scraper.skills import SkillMatcher
+from job_scraper.crawl_state import CrawlState, content_hash, crawl_scope
+from job_scraper.dedup import normalize_url, unique_urls
+from job_scraper.fetcher import (
+    RETRY_STATUSES, CircuitBreaker, HostLimiter, backoff_delay, fetch, make_session, retry_after_seconds,
+)
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
+SYNGENTA_BASE_URL = "https://jobs.syngenta.com"
+
+
 # ✅ Helper: Scrape Syngenta static pages
-def scrape_syngenta_html(start_url, skills, max_jobs=10, max_pages=5):
+def iter_syngenta_html(start_url, skills, max_jobs=10, max_pages=5, state=None):
+    """
+    Scrape Syngenta's static vacancy tiles, yielding each matching job.
+    With a CrawlState, tiles whose content is unchanged since the last crawl
+    are skipped and pagination stops at the first page of only seen jobs.
+    A failure on the first page is raised; later ones end the crawl.
+    """
     print("🕸️ Using static HTML scraper for Syngenta...", file=sys.stderr)
-    HEADERS = {"User-Agent": "Mozilla/5.0"}
-    all_jobs = []
+    collected = 0
     page = 1
+    matcher = SkillMatcher(skills)
+    session = make_session(pool_size=1)
+    limiter = HostLimiter(max_per_host=1)
 
-    while page <= max_pages and len(all_jobs) < max_jobs:
-        if "page=" in start_url:
-            url = re.sub(r"page=\d+", f"page={page}", start_url)
-        elif "?" in start_url:
-            url = f"{start_url}&page={page}"
-        else:
-            url = f"{start_url}?page={page}"
-
-        print(f"🌀 [Syngenta] Fetching page {page} ...", file=sys.stderr)
-        try:
-            res = requests.get(url, headers=HEADERS, timeout=20)
-            if res.status_code != 200:
-                print(f"⚠️ Syngenta failed on page {page} (status {res.status_code})", file=sys.stderr)
-                break
+    try:
+        while page <= max_pages and collected < max_jobs:
+            if "page=" in start_url:
+                url = re.sub(r"page=\d+", f"page={page}", start_url)
+            elif "?" in start_url:
+                url = f"{start_url}&page={page}"
+            else:
+                url = f"{start_url}?page={page}"
+
+            print(f"🌀 [Syngenta] Fetching page {page} ...", file=sys.stderr)
+            try:
+                res = fetch(session, url, limiter, timeout=20)
+                if res.status_code != 200:
+                    print(f"⚠️ Syngenta failed on page {page} (status {res.status_code})", file=sys.stderr)
+                    if page == 1:
+                        raise RuntimeError(f"Syngenta listing returned HTTP {res.status_code}")
+                    break
 
-            soup = BeautifulSoup(res.text, "html.parser")
-            job_cards = soup.select(".attrax-vacancy-tile")
+                soup = make_soup(res.text, parse_only=only(class_="attrax-vacancy-tile"))
+                job_cards = soup.select(".attrax-vacancy-tile")
 
-            if not job_cards:
-                print("⚠️ No job cards found — stopping pagination.", file=sys.stderr)
-                break
+                if not job_cards:
+                    print("⚠️ No job cards found — stopping pagination.", file=sys.stderr)
+                    break
 
-            for card in job_cards:
-                if len(all_jobs) >= max_jobs:
+                already_seen = 0
+                for card in job_cards:
+                    if collected >= max_jobs:
+                        break
+
+                    title_el = card.select_one(".attrax-vacancy-tile__title")
+                    title = title_el.get_text(strip=True) if title_el else "N/A"
+
+                    link = title_el["href"] if title_el and title_el.has_attr("href") else None
+                    if link and not link.startswith("http"):
+                        link = f"{SYNGENTA_BASE_URL}{link}"
+
+                    location_el = card.select_one(".attrax-vacancy-tile__option-location .attrax-vacancy-tile__item-value")
+                    location = location_el.get_text(strip=True) if location_el else "N/A"
+
+                    desc_el = card.select_one(".attrax-vacancy-tile__description-value")
+                    desc = desc_el.get_text(strip=True) if desc_el else ""
+
+                    job_obj = {
+                        "company": "Syngenta",
+                        "title": title,
+                        "location": location,
+                        "apply_url": link,
+                        "description": desc,
+                        "matched_skills": matcher.find(title, desc),
+                    }
+
+                    if state is not None and link:
+                        digest = content_hash(title, location, desc)
+                        if state.is_unchanged(link, digest):
+                            state.touch(link)
+                            already_seen += 1
+                            continue
+                        state.record(link, digest=digest)
+
+                    if not matcher or job_obj["matched_skills"]:
+                        collected += 1
+                        yield job_obj
+
+                print(f"✅ [Syngenta] Page {page} done — total jobs: {collected}", file=sys.stderr)
+                if state is not None and already_seen == len(job_cards):
+                    print(f"⏹️ Page {page} only has already-seen jobs. Stopping.", file=sys.stderr)
                     break
+                page += 1
+            except Exception as e:
+                print(f"❌ Error on Syngenta page {page}: {e}", file=sys.stderr)
+                if page == 1:
+                    raise
+                break
+    finally:
+        session.close()
 
-                title_el = card.select_one(".attrax-vacancy-tile__title")
-                title = title_el.get_text(strip=True) if title_el else "N/A"
 
-                link = title_el["href"] if title_el and title_el.has_attr("href") else None
-                if link and not link.startswith("http"):
-                    link = f"https://jobs.syngenta.com{link}"
+def scrape_syngenta_html(start_url, skills, max_jobs=10, max_pages=5, state=None):
+    """List-returning wrapper around iter_syngenta_html."""
+    return list(iter_syngenta_html(start_url, skills, max_jobs, max_pages, state))
 
-                location_el = card.select_one(".attrax-vacancy-tile__option-location .attrax-vacancy-tile__item-value")
-                location = location_el.get_text(strip=True) if location_el else "N/A"
 
-                desc_el = card.select_one(".attrax-vacancy-tile__description-value")
-                desc = desc_el.get_text(strip=True) if desc_el else ""
+JOB_LIST_SELECTOR = "a[href*='job'], .job, .job-card"
+BLOCKED_RESOURCE_TYPES = {"image", "font", "stylesheet", "media"}
 
-                job_obj = {
-                    "company": "Syngenta",
-                    "title": title,
-                    "location": location,
-                    "apply_url": link,
-                    "description": desc
-                }
 
-                if not skills or any(s.lower() in desc.lower() for s in skills):
-                    all_jobs.append(job_obj)
+async def _block_heavy_resources(route):
+    """Abort requests that only matter for rendering, not for extraction."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
 
-            print(f"✅ [Syngenta] Page {page} done — total jobs: {len(all_jobs)}", file=sys.stderr)
-            page += 1
-        except Exception as e:
-            print(f"❌ Error on Syngenta page {page}: {e}", file=sys.stderr)
-            break
 
-    return all_jobs
+async def _click_and_wait_for_new_listing(page, next_button):
+    """Click pagination and wait until the first job link changes instead of sleeping."""
+    first_link = await page.evaluate(
+        "() => { const a = document.querySelector(\"a[href*='job']\"); return a ? a.href : null; }"
+    )
+    await next_button.click()
+    await page.wait_for_load_state("domcontentloaded")
+    try:
+        await page.wait_for_function(
+            "(prev) => { const a = document.querySelector(\"a[href*='job']\"); return a && a.href !== prev; }",
+            arg=first_link,
+            timeout=15000,
+        )
+    except PlaywrightTimeoutError:
+        print("⚠️ Listing did not change after pagination click.", file=sys.stderr)
+    await page.wait_for_selector(JOB_LIST_SELECTOR, timeout=60000)
+
+
+def _anchor_texts(soup, base):
+    """Absolute link → its longest anchor text, the cheap listing-level view of a job."""
+    texts = {}
+    for a in soup.find_all("a", href=True):
+        link = urljoin(base, a["href"])
+        text = a.get_text(" ", strip=True)
+        if link not in texts or len(text) > len(texts[link]):
+            texts[link] = text
+    return texts
+
+
+def _slug_text(link):
+    # Job URLs usually carry the title, e.g. /job/pune/senior-python-developer/123
+    return re.sub(r"[-_/+.]|%20", " ", urlparse(link).path)
+
+
+def _collect(jobs, on_job=None, results=None):
+    """Drain a blocking job iterator (run in an executor), passing each job to `on_job`."""
+    results = [] if results is None else results
+    for job in jobs:
+        results.append(job)
+        if on_job:
+            on_job(job)
+    return results
 
 
 # ✅ Main async crawler (Barclays)
-async def crawl(params):
+async def crawl_with_browser(browser, params, on_job=None):
+    """
+    Run one crawl on an already-launched browser and return the job list.
+    `on_job` is called with each job as soon as it is accepted.
+
+    Optional params: `page_pool_size` tabs visit job links concurrently
+    (default 4), `block_resources` skips images, fonts and stylesheets,
+    `state_path` enables incremental crawling against a CrawlState index,
+    `prefilter` (default False) only visits links whose anchor text or URL
+    matches the skills and `enrich=False` returns unvisited job stubs.
+    With `api_capture` (default True) the JSON listing API the site calls
+    while rendering is recorded and paginated over plain HTTP instead of
+    driving the browser; the DOM is only scraped when no such API is seen.
+    `http_cache` holds the caller's response cache settings (None: no cache),
+    applied before anything is fetched.
+    """
+    http_cache.configure(params.get("http_cache"))
+    state = None
+    if params.get("state_path"):
+        if "syngenta" in params["url"].lower():
+            scope = crawl_scope(params["skills"])
+        else:
+            scope = crawl_scope(params["skills"], params.get("prefilter", False), params.get("enrich", True))
+        state = CrawlState(params["state_path"], scope)
+    try:
+        return await _crawl_with_browser(browser, params, state, on_job)
+    finally:
+        if state is not None:
+            state.close()
+
+
+async def _crawl_with_browser(browser, params, state, on_job):
     start_url = params["url"]
     skills = params["skills"]
     max_jobs = params["max_jobs"]
     max_pages = params["max_pages"]
 
-    # --- handle Syngenta directly ---
+    # --- handle Syngenta directly (plain HTTP, in a thread so the event loop stays live) ---
     if "syngenta" in start_url.lower():
-        results = scrape_syngenta_html(start_url, skills, max_jobs, max_pages)
-        print(json.dumps(results))
-        return
+        return await asyncio.get_running_loop().run_in_executor(
+            None, _collect, iter_syngenta_html(start_url, skills, max_jobs, max_pages, state), on_job
+        )
+
+    page_pool_size = max(params.get("page_pool_size", 4), 1)
+    block_resources = params.get("block_resources", False)
+    prefilter = params.get("prefilter", False)
+    enrich = params.get("enrich", True)
+    capture = ApiCapture() if params.get("api_capture", True) else None
 
+    matcher = SkillMatcher(params["skills"])
     results = []
     visited = set()
-    retries = 2
+    retries = 3
+    breaker = CircuitBreaker()
+    visits = 0
 
     company_name = "Barclays" if "barclays" in start_url.lower() else "Unknown"
 
+    context = await browser.new_context()
     try:
-        async with async_playwright() as pw:
-            browser = await pw.chromium.launch(headless=True, args=["--no-sandbox"])
-            context = await browser.new_context()
-            page = await context.new_page()
-
-            print(f"🔍 Detected {company_name} URL — using Playwright scraper.", file=sys.stderr)
-            await page.goto(start_url, wait_until="networkidle", timeout=60000)
-
-            await page.wait_for_selector("a[href*='job'], .job, .job-card", timeout=60000)
-            await asyncio.sleep(2)
-
-            current_page = 1
-            while current_page <= max_pages and len(results) < max_jobs:
-                print(f"🌀 Extracting {company_name} page {current_page}", file=sys.stderr)
-                html = await page.content()
-                soup = BeautifulSoup(html, "html.parser")
-
-                job_links = get_job_links(soup, start_url)
-                print(f"🔗 Found {len(job_links)} job links on page {current_page}", file=sys.stderr)
-
-                for link in job_links:
-                    if len(results) >= max_jobs or link in visited:
-                        continue
-                    visited.add(link)
-
+        if block_resources:
+            await context.route("**/*", _block_heavy_resources)
+        page = await context.new_page()
+        if capture is not None:
+            page.on("response", capture.on_response)
+
+        print(f"🔍 Detected {company_name} URL — using Playwright scraper.", file=sys.stderr)
+        await page.goto(start_url, wait_until="networkidle", timeout=60000)
+
+        if capture is not None:
+            await capture.wait()
+            api = capture.best()
+            if api is not None:
+                print(f"🛰️ Found job API {api.method} {api.url} ({len(api.items)} jobs) — replaying over HTTP.",
+                      file=sys.stderr)
+                cookies = {c["name"]: c["value"] for c in await context.cookies()}
+                jobs = iter_api_jobs(
+                    api, start_url, company_name, skills, max_jobs, max_pages, state,
+                    prefilter=prefilter, enrich=enrich, cookies=cookies, workers=page_pool_size,
+                )
+                try:
+                    # Blocking HTTP replay: run it in a thread so the event loop (and heartbeats) keep going
+                    await asyncio.get_running_loop().run_in_executor(None, _collect, jobs, on_job, results)
+                except Exception as e:
+                    if results:
+                        print(f"⚠️ API replay stopped early: {e}", file=sys.stderr)
+                        return results
+                    print(f"⚠️ API replay failed ({e}) — falling back to the page DOM.", file=sys.stderr)
+                else:
+                    if results:
+                        return results
+                    print("⚠️ API replay found no jobs — falling back to the page DOM.", file=sys.stderr)
+
+        await page.wait_for_selector(JOB_LIST_SELECTOR, timeout=60000)
+
+        # Reusable pool of tabs for job pages; the semaphore bounds visits in flight
+        job_pages = asyncio.Queue()
+        for _ in range(page_pool_size):
+            job_pages.put_nowait(await context.new_page())
+        semaphore = asyncio.Semaphore(page_pool_size)
+
+        async def visit(link):
+            nonlocal visits
+            async with semaphore:
+                if len(results) >= max_jobs:
+                    return
+                job_page = job_pages.get_nowait()
+                try:
                     for attempt in range(retries):
-                        job_page = await context.new_page()
+                        if not breaker.allow(link):
+                            print(f"🔌 Circuit open — skipping {link}", file=sys.stderr)
+                            return
                         try:
-                            print(f"➡️ Visiting job {len(results)+1}: {link}", file=sys.stderr)
-                            await job_page.goto(link, wait_until="domcontentloaded", timeout=40000)
+                            print(f"➡️ Visiting job: {link}", file=sys.stderr)
+                            # Retry waits for the full load event too
+                            wait_until = "domcontentloaded" if attempt == 0 else "load"
+                            response = await job_page.goto(link, wait_until=wait_until, timeout=40000)
+                            if response is not None and response.status in RETRY_STATUSES:
+                                breaker.record_failure(link)
+                                if attempt == retries - 1:
+                                    print(f"⏭️ Skipping after HTTP {response.status}", file=sys.stderr)
+                                    break
+                                delay = retry_after_seconds(await response.all_headers())
+                                delay = backoff_delay(attempt) if delay is None else delay
+                                print(f"🔁 HTTP {response.status} for {link}; retry in {delay:.1f}s", file=sys.stderr)
+                                await asyncio.sleep(delay)
+                                continue
+                            breaker.record_success(link)
                             job_html = await job_page.content()
-                            job_soup = BeautifulSoup(job_html, "html.parser")
+                            visits += 1
+                            job_soup = make_soup(job_html)
 
                             job = extract_job_details(job_soup, link)
                             job["company"] = company_name
-                            if not skills or text_contains_any(job["description"], skills):
+                            job["matched_skills"] = matcher.find(job["title"], job["description"])
+                            job["enriched"] = True
+                            if len(results) >= max_jobs:
+                                break  # over the limit: left unrecorded so the next crawl still returns it
+                            if state is not None:
+                                state.record(link, job["job_id"], content_hash(job["title"], job["description"]))
+                            if not matcher or job["matched_skills"]:
                                 results.append(job)
-                            await job_page.close()
+                                if on_job:
+                                    on_job(job)
                             break
                         except Exception as e:
+                            breaker.record_failure(link)
                             print(f"❌ Error scraping job ({attempt+1}/{retries}): {e}", file=sys.stderr)
-                            await job_page.close()
-                            if attempt < retries - 1:
-                                await asyncio.sleep(2)
-                            else:
+                            if attempt == retries - 1:
                                 print("⏭️ Skipping after retries", file=sys.stderr)
-
-                # ✅ Try pagination (Barclays only)
-                next_button = await page.query_selector("button[aria-label='Next'], a.pagination__next")
-                if next_button:
-                    print(f"➡️ Navigating to next page ({current_page+1})", file=sys.stderr)
-                    await next_button.click()
-                    await page.wait_for_load_state("networkidle")
-                    await asyncio.sleep(4)
-                    current_page += 1
-                else:
-                    print("⚠️ No next button found — stopping pagination.", file=sys.stderr)
+                            else:
+                                await asyncio.sleep(backoff_delay(attempt))
+                finally:
+                    job_pages.put_nowait(job_page)
+
+        started = time.perf_counter()
+        current_page = 1
+        while current_page <= max_pages and len(results) < max_jobs:
+            print(f"🌀 Extracting {company_name} page {current_page}", file=sys.stderr)
+            html = await page.content()
+            # Only anchors are needed to find job links
+            soup = make_soup(html, parse_only=only("a"))
+
+            job_links = get_job_links(soup, start_url)
+            print(f"🔗 Found {len(job_links)} job links on page {current_page}", file=sys.stderr)
+
+            # Links differing only in tracking parameters, case or a trailing slash are one job
+            new_links = [link for link in unique_urls(job_links) if normalize_url(link) not in visited]
+            visited.update(normalize_url(link) for link in new_links)
+            if state is not None:
+                seen_links = {link for link in new_links if state.is_seen(link)}
+                for link in seen_links:
+                    state.touch(link)
+                if new_links and len(seen_links) == len(new_links):
+                    print(f"⏹️ Page {current_page} only has already-seen jobs. Stopping.", file=sys.stderr)
                     break
+                new_links = [link for link in new_links if link not in seen_links]
+
+            anchors = _anchor_texts(soup, start_url)
+            if matcher and (prefilter or not enrich):
+                # Cheap stage: only open job pages whose link already looks like a match
+                kept = [link for link in new_links if matcher.matches(anchors.get(link), _slug_text(link))]
+                print(f"🔎 {len(kept)}/{len(new_links)} links pass the listing filter", file=sys.stderr)
+                new_links = kept
+
+            if enrich:
+                await asyncio.gather(*(visit(link) for link in new_links))
+            else:
+                for link in new_links[: max_jobs - len(results)]:
+                    title = anchors.get(link, "")
+                    job = {
+                        "job_id": link.rstrip("/").split("/")[-1],
+                        "title": title,
+                        "company": company_name,
+                        "location": "",
+                        "application_link": link,
+                        "description": "",
+                        "matched_skills": matcher.find(title, _slug_text(link)),
+                        "enriched": False,
+                    }
+                    if state is not None:
+                        state.record(link, job["job_id"])
+                    results.append(job)
+                    if on_job:
+                        on_job(job)
+
+            if len(results) >= max_jobs:
+                break
+
+            # ✅ Try pagination (Barclays only)
+            next_button = await page.query_selector("button[aria-label='Next'], a.pagination__next")
+            if next_button:
+                print(f"➡️ Navigating to next page ({current_page+1})", file=sys.stderr)
+                await _click_and_wait_for_new_listing(page, next_button)
+                current_page += 1
+            else:
+                print("⚠️ No next button found — stopping pagination.", file=sys.stderr)
+                break
+
+        elapsed = time.perf_counter() - started
+        print(
+            f"⏱️ {visits} job pages in {elapsed:.2f}s "
+            f"({visits / elapsed if elapsed else 0:.2f} visits/sec, pool={page_pool_size})",
+            file=sys.stderr,
+        )
+    finally:
+        await context.close()
+
+    return results
 
-            await context.close()
-            await browser.close()
 
+async def launch_browser(pw):
+    return await pw.chromium.launch(headless=True, args=["--no-sandbox"])
+
+
+def _print_ndjson(job):
+    print(json.dumps(job), flush=True)
+
+
+async def crawl(params):
+    """
+    One-shot mode: launch a browser, crawl, stream each job to stdout as one
+    JSON line. Any failure exits with status 1, so the caller raises it.
+    """
+    # Syngenta is plain HTTP, so don't pay for a browser launch
+    if "syngenta" in params["url"].lower():
+        await crawl_with_browser(None, params, on_job=_print_ndjson)
+        return
+
+    try:
+        async with async_playwright() as pw:
+            browser = await launch_browser(pw)
+            try:
+                await crawl_with_browser(browser, params, on_job=_print_ndjson)
+            finally:
+                await browser.close()
     except Exception:
         traceback.print_exc(file=sys.stderr)
-        return []
-
-    print(json.dumps(results))
+        sys.exit(1)
+
+
+# ✅ Resident worker mode
+HEARTBEAT_INTERVAL = 15  # seconds between liveness messages during a crawl
+
+
+async def serve():
+    """
+    Long-lived mode: keep a warm browser and take crawl requests from stdin.
+
+    Protocol (one JSON object per line):
+      stdin  → {"id": ..., "params": {url, skills, max_jobs, max_pages, http_cache}}
+      stdout → {"type": "ready"} once the browser is up, then per request
+               {"id", "type": "job", "job": {...}} for every job as it is found
+               and finally {"id", "type": "done", "count": n}
+               or {"id", "type": "error", "error": "..."}
+               While a crawl runs, {"id", "type": "heartbeat"} is sent every
+               HEARTBEAT_INTERVAL seconds, so a crawl that is slow to find
+               matches is not mistaken for a hung worker.
+    A line that isn't a valid request gets an error reply (id null if it
+    has none) and the worker carries on. It exits when stdin is closed.
+    """
+    protocol_out = sys.stdout
+    # Anything else printed to stdout would corrupt the protocol stream
+    sys.stdout = sys.stderr
+    send_lock = threading.Lock()  # jobs may be reported from executor threads
+
+    def send(message):
+        with send_lock:
+            protocol_out.write(json.dumps(message) + "\n")
+            protocol_out.flush()
+
+    async def heartbeat(req_id):
+        # Sent from the event loop, so it stops if the loop itself hangs
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            send({"id": req_id, "type": "heartbeat"})
+
+    loop = asyncio.get_running_loop()
+    async with async_playwright() as pw:
+        browser = await launch_browser(pw)
+        send({"type": "ready"})
+
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.readline)
+            if not line:
+                break
+            if not line.strip():
+                continue
+
+            request = None
+            try:
+                request = json.loads(line)
+                req_id, params = request.get("id"), request["params"]
+            except (ValueError, AttributeError, KeyError, TypeError) as e:
+                # One bad request must not take down the worker and every crawl queued behind it
+                print(f"⚠️ Malformed request {line.strip()[:200]!r}: {e}", file=sys.stderr)
+                send({"id": request.get("id") if isinstance(request, dict) else None,
+                      "type": "error", "error": f"malformed request: {e}"})
+                continue
+
+            beat = asyncio.create_task(heartbeat(req_id))
+            try:
+                if not browser.is_connected():
+                    print("♻️ Browser disconnected — relaunching.", file=sys.stderr)
+                    browser = await launch_browser(pw)
+                results = await crawl_with_browser(
+                    browser,
+                    params,
+                    on_job=lambda job: send({"id": req_id, "type": "job", "job": job}),
+                )
+                send({"id": req_id, "type": "done", "count": len(results)})
+            except Exception as e:
+                traceback.print_exc(file=sys.stderr)
+                send({"id": req_id, "type": "error", "error": str(e)})
+            finally:
+                beat.cancel()
+
+        await browser.close()
 
 
 if __name__ == "__main__":
-    params = json.loads(sys.argv[1])
-    asyncio.run(crawl(params))
+    if sys.argv[1] == "--serve":
+        asyncio.run(serve())
+    else:
+        params = json.loads(sys.argv[1])
+        asyncio.run(crawl(params))
@@ -0,0 +1,153 @@
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from job_scraper.core import detect_company, iter_crawl_jobs
+from job_scraper import http_cache
+from job_scraper.exporters import open_exporters
+from job_scraper.worker_client import WorkerPool
+
+DEFAULT_TARGETS = [
+    {"url": "https://www.capgemini.com/in-en/careers/join-capgemini/job-search/?page=1"},
+    {"url": "https://search.jobs.barclays/search-jobs"},
+    {"url": "https://jobs.syngenta.com/jobs"},
+]
+
+
+# --------------------------- #
+# ✅ Multi-site crawl scheduler
+# --------------------------- #
+def _crawl_target(target, store, export, worker_pool):
+    url = target["url"]
+    started = time.perf_counter()
+    outcome = {"url": url, "company": detect_company(url), "jobs": [], "exports": [], "error": None}
+
+    try:
+        with open_exporters(export, outcome["company"]) as exporter:
+            for job in iter_crawl_jobs(
+                url,
+                target.get("skills", []),
+                target.get("max_jobs", 50),
+                target.get("max_pages", 3),
+                concurrency=target.get("concurrency", 4),
+                incremental=target.get("incremental", False),
+                prefilter=target.get("prefilter"),
+                worker_pool=worker_pool,
+            ):
+                outcome["jobs"].append(job)
+                exporter.write(job)
+        outcome["exports"] = exporter.paths
+        if store and outcome["jobs"]:
+            # Imported here so crawl-only runs don't load Chroma and the embedding model
+            from job_scraper.db_manager import store_jobs
+            store_jobs(outcome["company"], outcome["jobs"])
+    except Exception as e:
+        print(f"❌ Crawl failed for {url}: {e}", file=sys.stderr)
+        outcome["error"] = str(e)
+
+    outcome["count"] = len(outcome["jobs"])
+    outcome["seconds"] = time.perf_counter() - started
+    return outcome
+
+
+def _domain_lanes(targets, per_domain):
+    """
+    [(index, target)] lanes to crawl one after another: each domain's
+    targets dealt round-robin into at most `per_domain` lanes.
+    """
+    by_domain = {}
+    for i, target in enumerate(targets):
+        by_domain.setdefault(urlparse(target["url"]).netloc.lower(), []).append((i, target))
+    per_domain = max(per_domain, 1)
+    return [group[k::per_domain] for group in by_domain.values() for k in range(min(per_domain, len(group)))]
+
+
+def run_targets(targets, max_concurrency=3, per_domain=1, store=False, export=()):
+    """
+    Crawl several targets concurrently and aggregate the results.
+
+    Each target is a dict with `url` and optional `skills`, `max_jobs`,
+    `max_pages`, `concurrency`, `incremental` and `prefilter`. At most
+    `max_concurrency` crawls run at once and at most `per_domain` of them
+    against one domain. A domain's targets are split into `per_domain`
+    lanes that crawl sequentially, and the pool runs lanes, so targets
+    waiting on a busy domain never hold a slot another domain could use.
+    A failing target (including one whose crawler failed on its first
+    page) is reported in its `error` field and does not stop the others.
+    With `store=True` each target's jobs are upserted into ChromaDB;
+    `export` lists formats ("ndjson", "parquet", "excel") each target's jobs
+    are streamed to as they arrive.
+    """
+    started = time.perf_counter()
+
+    # One resident browser per concurrent crawl, so Playwright targets don't queue on one worker
+    # (browsers only start when a Playwright target needs one)
+    worker_pool = WorkerPool(size=max_concurrency)
+    try:
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            lanes = pool.map(
+                lambda lane: [(i, _crawl_target(t, store, export, worker_pool)) for i, t in lane],
+                _domain_lanes(targets, per_domain),
+            )
+            indexed = [pair for lane in lanes for pair in lane]
+    finally:
+        worker_pool.close()
+    outcomes = [outcome for _, outcome in sorted(indexed, key=lambda pair: pair[0])]
+
+    elapsed = time.perf_counter() - started
+    for o in outcomes:
+        status = f"❌ {o['error']}" if o["error"] else "✅"
+        print(f"{status} {o['company']}: {o['count']} jobs in {o['seconds']:.1f}s — {o['url']}", file=sys.stderr)
+    total = sum(o["count"] for o in outcomes)
+    print(f"🎯 {total} jobs from {len(outcomes)} sources in {elapsed:.1f}s", file=sys.stderr)
+
+    return {"results": outcomes, "total_jobs": total, "seconds": elapsed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawl several career sites in parallel (cron-friendly).")
+    parser.add_argument("--targets", help="JSON file with a list of targets (default: Capgemini, Barclays, Syngenta)")
+    parser.add_argument("--concurrency", type=int, default=3, help="max crawls running at once")
+    parser.add_argument("--per-domain", type=int, default=1, help="max concurrent crawls per domain")
+    parser.add_argument("--store", action="store_true", help="upsert results into ChromaDB")
+    parser.add_argument("--output", help="write the aggregated results to this JSON file")
+    parser.add_argument("--export", action="append", default=[], choices=["ndjson", "parquet", "excel"],
+                        help="also export each target's jobs in this format (repeatable)")
+    parser.add_argument("--cache", nargs="?", const=http_cache.DEFAULT_CACHE_PATH,
+                        help="serve repeat HTTP requests from an on-disk response cache (default path if no value)")
+    parser.add_argument("--cache-ttl", type=float, default=24 * 3600, help="seconds a cached response stays fresh")
+    parser.add_argument("--offline", action="store_true", help="only use the response cache; never hit the network")
+    args = parser.parse_args(argv)
+
+    cache = None
+    if args.cache or args.offline:
+        cache = http_cache.enable(args.cache or http_cache.DEFAULT_CACHE_PATH, ttl=args.cache_ttl, offline=args.offline)
+
+    targets = DEFAULT_TARGETS
+    if args.targets:
+        with open(args.targets, encoding="utf-8") as f:
+            targets = json.load(f)
+    if not targets:
+        parser.error(f"no targets to crawl in {args.targets}")
+
+    summary = run_targets(targets, args.concurrency, args.per_domain, store=args.store, export=args.export)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    if cache is not None:
+        stats = cache.stats()
+        print(
+            f"🗃️ HTTP cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%}), "
+            f"{stats['entries']} entries, {stats['bytes'] / 1e6:.1f} MB",
+            file=sys.stderr,
+        )
+
+    # Non-zero exit only when every source failed, so cron can alert on it
+    return 1 if all(o["error"] for o in summary["results"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
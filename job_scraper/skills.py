@@ -0,0 +1,104 @@
+import re
+
+# Common alternative spellings; a skill also matches any of its synonyms
+DEFAULT_SYNONYMS = {
+    "javascript": ["js", "ecmascript"],
+    "kubernetes": ["k8s"],
+    "postgresql": ["postgres"],
+    "machine learning": ["ml"],
+    "artificial intelligence": ["ai"],
+    "c#": ["csharp", "c sharp"],
+    ".net": ["dotnet", "dot net"],
+    "node.js": ["nodejs", "node js"],
+    "aws": ["amazon web services"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "ci/cd": ["cicd", "ci cd"],
+}
+
+_END = ""  # trie key marking the end of a term
+
+
+def _normalize(term):
+    return " ".join(term.lower().split())
+
+
+def _trie_pattern(node):
+    """
+    Regex for a character trie, e.g. {java, javascript, jira} →
+    j(?:ava(?:script)?|ira). Each position is matched in one pass over the
+    trie instead of trying every term, which keeps hundreds of skills cheap.
+    """
+    if list(node) == [_END]:
+        return None
+    branches = []
+    single_chars = []
+    for char in sorted(k for k in node if k != _END):
+        rest = _trie_pattern(node[char])
+        token = r"\s+" if char == " " else re.escape(char)
+        if rest is None and char != " ":
+            single_chars.append(token)
+        else:
+            branches.append(token + (rest or ""))
+    if single_chars:
+        branches.append(single_chars[0] if len(single_chars) == 1 else "[" + "".join(single_chars) + "]")
+
+    pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if _END in node:
+        pattern = f"(?:{pattern})?"
+    return pattern
+
+
+# --------------------------- #
+# ✅ Shared skill matcher
+# --------------------------- #
+class SkillMatcher:
+    """
+    Matches a skill list against job text in a single regex pass.
+
+    Built once per crawl: skills and their synonyms are compiled into one
+    case-insensitive, trie-shaped pattern with word boundaries, so "Java"
+    does not match "JavaScript" and "C++" / ".NET" still work.
+    `find()` returns the skills (as given) that occur in the text.
+    """
+
+    def __init__(self, skills, synonyms=None, use_default_synonyms=True):
+        self.skills = [s.strip() for s in skills or [] if s and s.strip()]
+        self._canonical = {}
+        extra = {_normalize(k): v for k, v in (synonyms or {}).items()}
+        for skill in self.skills:
+            key = _normalize(skill)
+            terms = [key, *extra.get(key, [])]
+            if use_default_synonyms:
+                terms += DEFAULT_SYNONYMS.get(key, [])
+            for term in terms:
+                self._canonical.setdefault(_normalize(term), skill)
+
+        self._regex = None
+        if self._canonical:
+            trie = {}
+            for term in self._canonical:
+                node = trie
+                for char in term:
+                    node = node.setdefault(char, {})
+                node[_END] = True
+            self._regex = re.compile(r"(?<!\w)" + _trie_pattern(trie) + r"(?!\w)", re.IGNORECASE)
+
+    def __bool__(self):
+        return bool(self.skills)
+
+    def find(self, *texts):
+        """Skills found in any of `texts`, in the order they were configured."""
+        if self._regex is None:
+            return []
+        found = set()
+        for text in texts:
+            if text:
+                for m in self._regex.finditer(text):
+                    found.add(self._canonical[_normalize(m.group(0))])
+        return [s for s in self.skills if s in found]
+
+    def matches(self, *texts):
+        """True when no skills are configured or any skill occurs in `texts`."""
+        if self._regex is None:
+            return True
+        return any(text and self._regex.search(text) for text in texts)
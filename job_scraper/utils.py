@@ -1,13 +1,16 @@
 import re
+from functools import lru_cache
+from .skills import SkillMatcher
 
 def sanitize_text(text):
     if not text:
         return ""
     return re.sub(r"\s+", " ", text.strip())
 
+@lru_cache(maxsize=32)
+def _matcher(skills):
+    return SkillMatcher(skills)
+
 def text_contains_any(text, skills):
-    text = text.lower()
-    for s in skills:
-        if s.lower() in text:
-            return True
-    return False
+    # Same whole-word, synonym-aware matching the crawlers use
+    return bool(_matcher(tuple(skills)).find(text))
@@ -0,0 +1,181 @@
+import atexit
+import itertools
+import json
+import queue
+import subprocess
+import sys
+import threading
+
+
+class WorkerCrashed(RuntimeError):
+    """The resident Playwright worker exited or stopped responding mid-crawl."""
+
+
+# --------------------------- #
+# ✅ Resident Playwright worker
+# --------------------------- #
+class PersistentWorker:
+    """
+    Client for one `run_playwright_worker --serve` process.
+
+    The process (and its Chromium) is started lazily, reused across crawls,
+    restarted after a crash and recycled every `max_crawls` crawls so that
+    browser memory leaks stay bounded.
+    """
+
+    def __init__(self, max_crawls=50, startup_timeout=90, idle_timeout=120):
+        self.max_crawls = max_crawls
+        self.startup_timeout = startup_timeout
+        # Max seconds without any message; the worker sends a heartbeat every
+        # 15s while crawling, so only a hung process runs into this
+        self.idle_timeout = idle_timeout
+        self._proc = None
+        self._lines = None
+        self._crawls = 0
+        self._ids = itertools.count(1)
+
+    def _start(self):
+        print("🚀 Starting resident Playwright worker ...", file=sys.stderr)
+        self._proc = subprocess.Popen(
+            [sys.executable, "-m", "job_scraper.run_playwright_worker", "--serve"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+        self._crawls = 0
+        self._lines = queue.Queue()
+        threading.Thread(target=self._pump, args=(self._proc, self._lines), daemon=True).start()
+
+        message = self._next_message(self.startup_timeout)
+        if message.get("type") != "ready":
+            self.close()
+            raise WorkerCrashed(f"Unexpected worker greeting: {message}")
+
+    @staticmethod
+    def _pump(proc, lines):
+        for line in proc.stdout:
+            lines.put(line)
+        lines.put(None)
+
+    def _next_message(self, timeout):
+        try:
+            line = self._lines.get(timeout=timeout)
+        except queue.Empty:
+            self.close()
+            raise WorkerCrashed(f"Worker sent nothing for {timeout}s")
+        if line is None:
+            self.close()
+            raise WorkerCrashed("Worker exited unexpectedly")
+        return json.loads(line)
+
+    def _ensure_running(self):
+        if self._proc is not None and self._crawls >= self.max_crawls:
+            print(f"♻️ Recycling Playwright worker after {self._crawls} crawls.", file=sys.stderr)
+            self.close()
+        if self._proc is None or self._proc.poll() is not None:
+            self.close()
+            self._start()
+
+    def iter_crawl(self, params):
+        """Send one crawl request and yield jobs as the worker streams them back."""
+        self._ensure_running()
+        req_id = next(self._ids)
+        self._crawls += 1
+        try:
+            self._proc.stdin.write(json.dumps({"id": req_id, "params": params}) + "\n")
+            self._proc.stdin.flush()
+        except OSError as e:
+            self.close()
+            raise WorkerCrashed(f"Could not send request to worker: {e}")
+
+        finished = False
+        try:
+            while True:
+                message = self._next_message(self.idle_timeout)
+                if message.get("id") != req_id:
+                    continue
+                if message["type"] == "heartbeat":
+                    continue  # still working, just nothing new to report
+                if message["type"] == "job":
+                    yield message["job"]
+                elif message["type"] == "done":
+                    finished = True
+                    return
+                elif message["type"] == "error":
+                    finished = True
+                    raise RuntimeError(message.get("error", "worker error"))
+        finally:
+            if not finished:
+                # Abandoned mid-crawl (e.g. cancelled): stop the browser rather than let it run on
+                self.close(kill=True)
+
+    def crawl(self, params):
+        return list(self.iter_crawl(params))
+
+    def close(self, kill=False):
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            if kill:
+                proc.kill()
+            else:
+                proc.stdin.close()
+            proc.wait(timeout=10)
+        except Exception:
+            proc.kill()
+
+
+class WorkerPool:
+    """A small pool of PersistentWorkers so concurrent callers don't share one browser."""
+
+    def __init__(self, size=1, max_crawls=50):
+        self._idle = queue.LifoQueue()
+        for _ in range(size):
+            self._idle.put(PersistentWorker(max_crawls=max_crawls))
+        self._all = list(self._idle.queue)
+
+    def _iter_on_worker(self, params):
+        worker = self._idle.get()
+        try:
+            yield from worker.iter_crawl(params)
+        finally:
+            self._idle.put(worker)
+
+    def iter_crawl(self, params):
+        """
+        Stream one crawl's jobs. If the worker crashes before sending any job
+        the crawl is retried once on a fresh process.
+        """
+        yielded = False
+        try:
+            for job in self._iter_on_worker(params):
+                yielded = True
+                yield job
+        except WorkerCrashed as e:
+            if yielded:
+                raise
+            print(f"⚠️ Playwright worker crashed ({e}) — retrying on a fresh worker.", file=sys.stderr)
+            yield from self._iter_on_worker(params)
+
+    def crawl(self, params):
+        return list(self.iter_crawl(params))
+
+    def close(self):
+        for worker in self._all:
+            worker.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool(size=1, max_crawls=50):
+    """Process-wide worker pool, created on first use and shut down at exit."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool(size=size, max_crawls=max_crawls)
+            atexit.register(_pool.close)
+        return _pool
@@ -1,28 +1,62 @@
+import math
 import streamlit as st
-from job_scraper.db_manager import query_jobs
+from job_scraper.db_manager import cache_stats, count_jobs, get_jobs_page, query_jobs, warm_up
+
+PAGE_SIZE = 20
 
 st.set_page_config(page_title="Semantic Job Search", layout="centered")
 st.title("🔍 Semantic Job Search (via ChromaDB)")
 st.caption("Search across Capgemini, Barclays, and Syngenta jobs using natural language.")
 
+
+@st.cache_resource(show_spinner="Loading ChromaDB and the embedding model ...")
+def load_search_backend():
+    """Open the Chroma client and embedding model once per server; every session reuses them."""
+    warm_up()
+
+
+load_search_backend()
+
 company = st.selectbox("Select company (optional)", ["All", "Capgemini", "Barclays", "Syngenta"])
-query_text = st.text_input("Enter search query", "Python developer")
+query_text = st.text_input("Enter search query (leave empty to browse all jobs)", "Python developer")
+location = st.text_input("Location (optional, exact match)", "")
+mode = st.radio(
+    "Search mode", ["hybrid", "keyword", "semantic"], horizontal=True,
+    help="keyword: exact words via the BM25 index (no embedding); semantic: meaning; hybrid: both, fused",
+)
 
+# Keep showing results across reruns (e.g. when the page number changes)
 if st.button("Search"):
-    st.info("Searching in ChromaDB... ⏳")
+    st.session_state["searched"] = True
 
+if st.session_state.get("searched"):
     company_name = None if company == "All" else company
+    location_filter = location.strip() or None
 
-    # 1️⃣ Search top matches
-    results = query_jobs(company_name=company_name, query_text=query_text, n_results=10)
-
-    # 2️⃣ Get total count of matches
-    total_count = query_jobs(company_name=company_name, query_text=query_text, count_only=True)
+    # 1️⃣ Count jobs in scope. Keyword search only returns jobs containing every query word, so count those
+    # (BM25 index, no search); semantic and hybrid rank every job in scope, so all of them are reachable.
+    keyword_only = bool(query_text.strip()) and mode == "keyword"
+    total_count = count_jobs(
+        company_name=company_name, location=location_filter, query_text=query_text.strip() if keyword_only else None,
+    )
+    st.subheader(f"🔢 Total matching jobs: {total_count}" if keyword_only or not query_text.strip()
+                 else f"🔢 Jobs ranked: {total_count}")
 
-    st.subheader(f"🔢 Total matching jobs: {total_count}")
+    # 2️⃣ One page at a time so memory stays bounded
+    total_pages = max(1, math.ceil(total_count / PAGE_SIZE))
+    page = int(st.number_input("Page", min_value=1, max_value=total_pages, value=1))
+    if query_text.strip():
+        results = query_jobs(
+            company_name=company_name, query_text=query_text, n_results=PAGE_SIZE,
+            offset=(page - 1) * PAGE_SIZE, location=location_filter, mode=mode,
+        )
+        heading = f"Page {page} of {total_pages} ({mode} ranking):"
+    else:
+        results = get_jobs_page(company_name=company_name, page=page, page_size=PAGE_SIZE, location=location_filter)
+        heading = f"Page {page} of {total_pages}:"
 
     if results:
-        st.success(f"Top {len(results)} semantic matches:")
+        st.success(heading)
         for r in results:
             st.markdown(f"""
             **{r['title']}**  
@@ -34,3 +68,9 @@ if st.button("Search"):
             """)
     else:
         st.warning("No matching jobs found.")
+
+    stats = cache_stats()
+    st.caption(
+        f"Cache — embeddings: {stats['query_embeddings']['hits']} hits / {stats['query_embeddings']['misses']} misses, "
+        f"results: {stats['query_results']['hits']} hits / {stats['query_results']['misses']} misses"
+    )
@@ -0,0 +1,29 @@
+from job_scraper import core
+from job_scraper.crawl_queue import CrawlQueue, run_crawl
+
+
+class RecordingPool:
+    """Stands in for the resident worker pool; keeps the params of every crawl sent to it."""
+
+    def __init__(self):
+        self.requests = []
+
+    def iter_crawl(self, params):
+        self.requests.append(params)
+        return iter(())
+
+
+def test_cache_flags_reach_the_resident_worker_per_crawl(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    pool = RecordingPool()
+    monkeypatch.setattr(core, "get_worker_pool", lambda: pool)
+    queue = CrawlQueue(str(tmp_path / "queue.sqlite3"))
+    for flags in ({"cache": True}, {"cache": True, "offline": True}, {}):
+        queue.submit(dict({"url": "https://example.com/jobs", "store": False}, **flags))
+        run_crawl(queue, queue.claim("worker-1"), "worker-1")
+
+    sent = [request["http_cache"] for request in pool.requests]
+    assert sent[0]["offline"] is False
+    assert sent[1]["offline"] is True
+    assert sent[2] is None
+    queue.close()
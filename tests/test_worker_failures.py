@@ -0,0 +1,10 @@
+import pytest
+
+from job_scraper import core
+
+
+def test_one_shot_worker_failure_raises(monkeypatch, tmp_path):
+    # No browsers installed here, so the one-shot worker's launch fails
+    monkeypatch.setenv("PLAYWRIGHT_BROWSERS_PATH", str(tmp_path))
+    with pytest.raises(RuntimeError, match="exited with status 1"):
+        core.crawl_jobs("https://example.com/jobs", [], persistent=False)